@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""Benchmark event loop responsiveness while cleaning a hub with a huge snapshot.
+
+Starts a local stand-in Hue Hub (HTTPS, own thread and loop) that serves a
+multi-megabyte /clip/v2/resource payload, runs several cleanup cycles through
+HueCleanerEngine and measures how late a 5 ms ticker on the same loop wakes up.
+Each run is done twice: with snapshots parsed inline and with the executor
+offload, and fails if the offloaded run exceeds the lag budget.
+
+Requires aiohttp and the openssl command line tool.
+"""
+import argparse
+import asyncio
+import json
+import os
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+
+import aiohttp
+from aiohttp import web
+
+from custom_components.hue_cleaner.engine import HueCleanerEngine
+
+# What remains after offloading is mostly gen-2 garbage collection of the
+# freshly decoded snapshot, which stalls every thread
+MAX_LAG_BUDGET_MS = 100
+TICK_INTERVAL = 0.005
+
+
+def build_payload(target_mb: float) -> bytes:
+    """Return a resource snapshot of roughly the requested size."""
+    resources = [
+        {
+            "id": "area-1",
+            "type": "entertainment_configuration",
+            "name": "Living room TV",
+            "status": "inactive",
+        }
+    ]
+    padding = "x" * 200
+    count = 0
+    while True:
+        resources.append(
+            {
+                "id": f"scene-{count}",
+                "type": "scene",
+                "metadata": {"name": f"Scene {count}", "padding": padding},
+                "group": {"rid": f"room-{count % 50}", "rtype": "room"},
+                "actions": [
+                    {"target": {"rid": f"light-{count}-{n}", "rtype": "light"}}
+                    for n in range(4)
+                ],
+            }
+        )
+        count += 1
+        if count % 1000 == 0:
+            body = json.dumps({"errors": [], "data": resources}).encode()
+            if len(body) >= target_mb * 1024 * 1024:
+                return body
+
+
+def start_bridge(payload: bytes, certfile: str, keyfile: str) -> tuple[int, Callable[[], None]]:
+    """Serve the payload from a thread and return (port, stop)."""
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    state = {}
+
+    async def resources(request: web.Request) -> web.Response:
+        return web.Response(body=payload, content_type="application/json")
+
+    async def serve() -> None:
+        app = web.Application()
+        app.router.add_get("/clip/v2/resource", resources)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        context.load_cert_chain(certfile, keyfile)
+        site = web.TCPSite(runner, "127.0.0.1", 0, ssl_context=context)
+        await site.start()
+        state["port"] = site._server.sockets[0].getsockname()[1]
+        state["runner"] = runner
+        started.set()
+
+    def run() -> None:
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(serve())
+        loop.run_forever()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    started.wait()
+
+    def stop() -> None:
+        asyncio.run_coroutine_threadsafe(state["runner"].cleanup(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+
+    return state["port"], stop
+
+
+async def measure(port: int, cycles: int, threshold: int) -> tuple[float, float]:
+    """Run cleanup cycles and return (max ticker lag, max recorded block) in ms."""
+    max_lag = 0.0
+    done = asyncio.Event()
+
+    async def ticker() -> None:
+        nonlocal max_lag
+        while not done.is_set():
+            expected = time.perf_counter() + TICK_INTERVAL
+            await asyncio.sleep(TICK_INTERVAL)
+            max_lag = max(max_lag, (time.perf_counter() - expected) * 1000)
+
+    connector = aiohttp.TCPConnector(ssl=False)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        engine = HueCleanerEngine(
+            f"127.0.0.1:{port}", "benchmark", session, large_payload_threshold=threshold)
+        ticker_task = asyncio.create_task(ticker())
+        for _ in range(cycles):
+            await engine.async_clean()
+        done.set()
+        await ticker_task
+        await engine.async_shutdown()
+    return max_lag, engine.loop_block.max or 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=float, default=4, help="Snapshot size")
+    parser.add_argument("--cycles", type=int, default=5, help="Cleanup cycles per run")
+    args = parser.parse_args()
+
+    payload = build_payload(args.size_mb)
+    print(f"Stand-in hub snapshot: {len(payload) / 1024 / 1024:.1f} MB")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        certfile = os.path.join(tmp, "cert.pem")
+        keyfile = os.path.join(tmp, "key.pem")
+        subprocess.run(
+            ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+             "-keyout", keyfile, "-out", certfile, "-days", "1", "-subj", "/CN=localhost"],
+            check=True,
+            capture_output=True,
+        )
+        port, stop = start_bridge(payload, certfile, keyfile)
+        try:
+            inline_lag, inline_block = asyncio.run(
+                measure(port, args.cycles, threshold=sys.maxsize))
+            offload_lag, offload_block = asyncio.run(
+                measure(port, args.cycles, threshold=0))
+        finally:
+            stop()
+
+    print(f"Inline parsing:    max loop lag {inline_lag:.1f} ms, max block {inline_block:.1f} ms")
+    print(f"Executor offload:  max loop lag {offload_lag:.1f} ms, max block {offload_block:.1f} ms")
+    if offload_lag > MAX_LAG_BUDGET_MS:
+        print(f"❌ Loop lag over budget ({MAX_LAG_BUDGET_MS} ms)")
+        sys.exit(1)
+    print("✅ Event loop stays responsive")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,40 +2,34 @@
 from __future__ import annotations
 
 import logging
-
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from typing import TYPE_CHECKING
 
 from .const import DOMAIN
-from .coordinator import HueCleanerCoordinator
-from . import services
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.BUTTON]
+# Plain strings keep this package importable without Home Assistant, which the
+# standalone daemon relies on
+PLATFORMS: list[str] = ["sensor", "button"]
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Hue Cleaner from a config entry."""
+    from homeassistant.exceptions import ConfigEntryNotReady
+
+    from . import services
+    from .hub import async_get_registry
+
     try:
         _LOGGER.debug(f"Starting setup for entry {entry.entry_id}")
         hass.data.setdefault(DOMAIN, {})
 
-        # Create coordinator
-        coordinator = HueCleanerCoordinator(
-            hass,
-            entry.data["host"],
-            entry.data["api_key"]
-        )
-
-        # Fetch initial data
-        _LOGGER.debug("Fetching initial data")
-        await coordinator.async_config_entry_first_refresh()
-
-        # Start tracking entertainment area entities
-        _LOGGER.debug("Starting coordinator")
-        await coordinator.async_start()
+        # Entries pointing at the same hub share one coordinator
+        coordinator = await async_get_registry(hass).async_acquire(entry)
 
         hass.data[DOMAIN][entry.entry_id] = coordinator
 
@@ -49,17 +43,24 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
         _LOGGER.info("Hue Cleaner setup completed successfully")
         return True
+    except ConfigEntryNotReady:
+        # Hub unreachable for now, let Home Assistant retry the setup
+        raise
     except Exception as err:
         _LOGGER.error(f"Error setting up Hue Cleaner: {err}", exc_info=True)
+        # Do not keep the shared coordinator polling for an entry that failed
+        if hass.data[DOMAIN].pop(entry.entry_id, None) is not None:
+            await async_get_registry(hass).async_release(entry)
         return False
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
+    from .hub import async_get_registry
+
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
-        if coordinator:
-            await coordinator.async_shutdown()
+        hass.data[DOMAIN].pop(entry.entry_id)
+        await async_get_registry(hass).async_release(entry)
 
     return unload_ok
@@ -1,6 +1,8 @@
 """Button platform for Hue Cleaner integration."""
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from homeassistant.components.button import ButtonEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
@@ -8,7 +10,9 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
-from .coordinator import HueCleanerCoordinator
+
+if TYPE_CHECKING:
+    from .coordinator import HueCleanerCoordinator
 
 
 async def async_setup_entry(
@@ -0,0 +1,133 @@
+"""Orphaned resource collectors for Hue Cleaner integration."""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+
+from .const import (
+    ENTERTAINMENT_AREA_INACTIVE_STATUS,
+    ENTERTAINMENT_AREA_NAME_PATTERN,
+    ENTERTAINMENT_CONFIGURATION,
+)
+from .index import BridgeResourceIndex
+
+
+class OrphanCollector(ABC):
+    """Find garbage of one resource type in a shared resource index."""
+
+    key: str
+    resource_type: str
+
+    def __init__(self, include_active: bool = False) -> None:
+        """Initialize.
+
+        Args:
+            include_active: If True, also collect resources currently in use.
+        """
+        self.include_active = include_active
+
+    def find(self, index: BridgeResourceIndex) -> list[dict]:
+        """Return the resources that can be deleted."""
+        return [
+            resource
+            for resource in index.of_type(self.resource_type)
+            if self.is_orphan(resource, index)
+        ]
+
+    @abstractmethod
+    def is_orphan(self, resource: dict, index: BridgeResourceIndex) -> bool:
+        """Return True if the resource is garbage."""
+
+
+class EntertainmentAreaCollector(OrphanCollector):
+    """Entertainment areas left behind by Philips TVs."""
+
+    key = "entertainment_area"
+    resource_type = ENTERTAINMENT_CONFIGURATION
+
+    def is_orphan(self, resource: dict, index: BridgeResourceIndex) -> bool:
+        """Match the TV naming pattern, and only inactive areas by default."""
+        if ENTERTAINMENT_AREA_NAME_PATTERN not in resource.get("name", ""):
+            return False
+        return (
+            self.include_active
+            or ENTERTAINMENT_AREA_INACTIVE_STATUS in resource.get("status", "")
+        )
+
+
+class UnusedEntertainmentCollector(OrphanCollector):
+    """Other entertainment areas whose entertainment services are all gone.
+
+    The per-light `entertainment` services belong to their devices and go
+    away with them, so what is left unused is the area that pointed at them.
+    """
+
+    key = "unused_entertainment"
+    resource_type = ENTERTAINMENT_CONFIGURATION
+
+    def is_orphan(self, resource: dict, index: BridgeResourceIndex) -> bool:
+        """Match inactive areas whose members all point at missing services."""
+        if ENTERTAINMENT_AREA_NAME_PATTERN in resource.get("name", ""):
+            return False  # Handled by EntertainmentAreaCollector
+        if ENTERTAINMENT_AREA_INACTIVE_STATUS not in resource.get("status", ""):
+            return False
+        services = [
+            member["service"]["rid"]
+            for channel in resource.get("channels", [])
+            for member in channel.get("members", [])
+            if "service" in member
+        ]
+        # An area without members is being set up, not left behind
+        return bool(services) and not any(index.exists(rid) for rid in services)
+
+
+class OrphanedSceneCollector(OrphanCollector):
+    """Scenes whose room or zone was deleted."""
+
+    key = "orphaned_scene"
+    resource_type = "scene"
+
+    def is_orphan(self, resource: dict, index: BridgeResourceIndex) -> bool:
+        """Match scenes pointing at a group that no longer exists."""
+        group = resource.get("group")
+        return bool(group) and not index.exists(group.get("rid"))
+
+
+class EmptyZoneCollector(OrphanCollector):
+    """Zones with no lights left in them."""
+
+    key = "empty_zone"
+    resource_type = "zone"
+
+    def is_orphan(self, resource: dict, index: BridgeResourceIndex) -> bool:
+        """Match zones without any existing child."""
+        children = resource.get("children", [])
+        return not any(index.exists(child.get("rid")) for child in children)
+
+
+class StaleBehaviorCollector(OrphanCollector):
+    """Automations that errored or lost a critical dependency."""
+
+    key = "stale_behavior"
+    resource_type = "behavior_instance"
+
+    def is_orphan(self, resource: dict, index: BridgeResourceIndex) -> bool:
+        """Match errored behaviors or ones whose critical target is gone."""
+        if resource.get("status") == "errored":
+            return True
+        return any(
+            dependee.get("level") == "critical"
+            and not index.exists(dependee.get("target", {}).get("rid"))
+            for dependee in resource.get("dependees", [])
+        )
+
+
+COLLECTORS: dict[str, type[OrphanCollector]] = {
+    collector.key: collector
+    for collector in (
+        EntertainmentAreaCollector,
+        UnusedEntertainmentCollector,
+        OrphanedSceneCollector,
+        EmptyZoneCollector,
+        StaleBehaviorCollector,
+    )
+}
@@ -14,7 +14,7 @@ from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import aiohttp_client
 from homeassistant.helpers import issue_registry
 
-from .const import DOMAIN, HUE_API_BASE
+from .const import DOMAIN, HUE_API_BASE, HUE_BRIDGE_CONFIG_API
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -59,6 +59,14 @@ class HueCleanerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             else:
                 # Test connection to Hue Hub
                 if await self._test_connection(hue_ip):
+                    # Refuse a second entry for the same physical hub
+                    bridge_id = await self._fetch_bridge_id(hue_ip)
+                    if bridge_id:
+                        await self.async_set_unique_id(bridge_id)
+                        self._abort_if_unique_id_configured(
+                            updates={CONF_HOST: hue_ip})
+                    self._async_abort_entries_match({CONF_HOST: hue_ip})
+
                     self.hue_ip = hue_ip
                     return await self.async_step_api_key()
                 else:
@@ -202,6 +210,27 @@ class HueCleanerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             pass
         return False
 
+    async def _fetch_bridge_id(self, hue_ip: str) -> str | None:
+        """Fetch the bridge ID from the unauthenticated config endpoint."""
+        try:
+            session = aiohttp_client.async_get_clientsession(
+                self.hass, verify_ssl=False)
+            url = HUE_BRIDGE_CONFIG_API.format(ip=hue_ip)
+
+            async with session.get(
+                url,
+                timeout=aiohttp.ClientTimeout(total=10),
+                ssl=False
+            ) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    bridge_id = data.get("bridgeid")
+                    if bridge_id:
+                        return bridge_id.lower()
+        except Exception as e:
+            _LOGGER.debug("Bridge ID lookup failed: %s", str(e))
+        return None
+
     async def _fetch_api_key(self, hue_ip: str) -> str | None:
         """Fetch API key from Hue Hub (user must press button first)."""
         try:
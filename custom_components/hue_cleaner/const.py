@@ -2,6 +2,9 @@
 
 DOMAIN = "hue_cleaner"
 
+# Key in hass.data[DOMAIN] holding the shared hub registry
+DATA_HUBS = "hubs"
+
 # Configuration keys
 CONF_HUE_IP = "hue_ip"
 CONF_API_KEY = "api_key"
@@ -10,11 +13,42 @@ CONF_API_KEY = "api_key"
 DEFAULT_SCAN_INTERVAL = 3600  # 1 hour in seconds (fallback polling)
 DEFAULT_TIMEOUT = 10
 DEFAULT_CLEANUP_DELAY = 5  # seconds to wait before cleaning after new area detection
+STREAMING_RECHECK_INTERVAL = 60  # seconds between polls while cleanups are held without sensors
+DELETE_INTERVAL = 0.5  # seconds between deletes to avoid overwhelming the hub
+DEFAULT_DELETE_LATENCY = 0.2  # seconds, used for plan estimates before any delete is measured
+PLAN_TTL = 300  # seconds a cleanup plan can be executed for
+DEFAULT_METRICS_PORT = 9464  # standalone daemon, 0 disables the endpoint
 
 # API endpoints
 HUE_API_BASE = "https://{ip}/api"
-HUE_ENTERTAINMENT_API = "https://{ip}/clip/v2/resource/entertainment_configuration"
+HUE_BRIDGE_CONFIG_API = "https://{ip}/api/0/config"
+HUE_RESOURCE_API = "https://{ip}/clip/v2/resource"
 
 # Entertainment area patterns
 ENTERTAINMENT_AREA_NAME_PATTERN = "Entertainment area"
 ENTERTAINMENT_AREA_INACTIVE_STATUS = "inactive"
+ENTERTAINMENT_AREA_ACTIVE_STATUS = "active"
+ENTERTAINMENT_CONFIGURATION = "entertainment_configuration"
+
+# Collectors whose findings are deleted automatically; the others only report
+DEFAULT_COLLECTORS = ["entertainment_area"]
+
+# Health states; every state other than OK is also a repair issue type
+HEALTH_OK = "ok"
+ERROR_TYPES = ["ip_change", "api_key_expired", "connection_error"]
+
+# Events
+EVENT_AREA_CLEANED = "hue_cleaner_area_cleaned"
+
+# Number of recent cleanups used for latency percentiles
+LATENCY_SAMPLE_SIZE = 100
+
+# Request scheduling (lower value runs first)
+PRIORITY_MANUAL = 0
+PRIORITY_EVENT = 1
+PRIORITY_POLL = 2
+DEFAULT_MAX_CONCURRENT_REQUESTS = 2
+
+# Event loop protection
+LARGE_PAYLOAD_THRESHOLD = 256 * 1024  # bytes; bigger snapshots are parsed in an executor
+LOOP_BLOCK_WARNING_MS = 50
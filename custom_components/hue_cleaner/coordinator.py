@@ -3,23 +3,25 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from datetime import datetime, timedelta
+from datetime import timedelta
 
-import aiohttp
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from homeassistant.helpers.event import async_track_state_change
-from homeassistant.helpers.issue_registry import async_create_issue, async_delete_issue, IssueSeverity
-from homeassistant.components import persistent_notification
 
 from .const import (
     DEFAULT_SCAN_INTERVAL,
     DEFAULT_CLEANUP_DELAY,
-    HUE_ENTERTAINMENT_API,
-    ENTERTAINMENT_AREA_NAME_PATTERN,
-    ENTERTAINMENT_AREA_INACTIVE_STATUS,
     DOMAIN,
+    ERROR_TYPES,
+    EVENT_AREA_CLEANED,
+    HEALTH_OK,
+    PRIORITY_MANUAL,
+    PRIORITY_EVENT,
+    PRIORITY_POLL,
+    STREAMING_RECHECK_INTERVAL,
 )
+from .engine import HueCleanerEngine
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,12 +34,21 @@ class HueCleanerCoordinator(DataUpdateCoordinator):
         self.hass = hass
         self.hue_ip = hue_ip
         self.api_key = api_key
-        self.cleaned_count = 0
-        self.last_clean = None
         self._entertainment_area_entities = []
         self._unsubscribe_trackers = []
+        self._unsub_streaming_recheck = None
         self._connection_issues = 0
         self._max_connection_issues = 3
+        # Health state machine: the registries are only written on transitions
+        self._health = HEALTH_OK
+        self._open_issues: set[str] = set()
+        # Fetch/filter/delete logic lives in the HA independent engine
+        self.engine = HueCleanerEngine(
+            hue_ip,
+            api_key,
+            async_get_clientsession(hass, verify_ssl=False),
+            on_area_cleaned=self._on_area_cleaned,
+        )
 
         super().__init__(
             hass,
@@ -46,6 +57,31 @@ class HueCleanerCoordinator(DataUpdateCoordinator):
             update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
         )
 
+    @property
+    def cleaned_count(self) -> int:
+        """Return the total number of resources cleaned."""
+        return self.engine.cleaned_count
+
+    @property
+    def last_clean(self):
+        """Return when resources were last cleaned."""
+        return self.engine.last_clean
+
+    @property
+    def cleanup_latency(self):
+        """Return the rolling inactivity-to-deletion latency."""
+        return self.engine.cleanup_latency
+
+    @property
+    def orphan_counts(self) -> dict[str, int]:
+        """Return the orphans found per collector in the last cycle."""
+        return self.engine.orphan_counts
+
+    @property
+    def scheduler(self):
+        """Return the request scheduler of this hub."""
+        return self.engine.scheduler
+
     async def async_start(self) -> None:
         """Start listening to entertainment area entities."""
         await self._setup_entertainment_area_tracking()
@@ -70,6 +106,9 @@ class HueCleanerCoordinator(DataUpdateCoordinator):
         _LOGGER.info(
             f"Tracking {len(entertainment_entities)} entertainment area entities - using event-driven cleanup")
 
+        # Only needed in event-driven mode
+        from homeassistant.helpers.event import async_track_state_change
+
         # Track state changes for all entertainment area entities
         for entity_id in entertainment_entities:
             unsubscribe = async_track_state_change(
@@ -79,6 +118,7 @@ class HueCleanerCoordinator(DataUpdateCoordinator):
             )
             self._unsubscribe_trackers.append(unsubscribe)
 
+    @callback
     def _on_entertainment_area_change(self, entity_id, old_state, new_state):
         """Handle entertainment area state changes."""
         if new_state is None:
@@ -86,6 +126,8 @@ class HueCleanerCoordinator(DataUpdateCoordinator):
 
         _LOGGER.debug(
             f"Entertainment area {entity_id} changed: {old_state.state if old_state else 'None'} -> {new_state.state}")
+        # Cached plans have to be checked against the hub again
+        self.engine.invalidate_snapshot()
 
         # If a new entertainment area is created, trigger cleanup after a delay
         if old_state is None and new_state.state == "on":
@@ -93,10 +135,42 @@ class HueCleanerCoordinator(DataUpdateCoordinator):
             # Schedule cleanup after a short delay to allow the area to be fully created
             self.hass.async_create_task(self._delayed_cleanup())
 
+        if old_state is not None and old_state.state == "on" and new_state.state == "off":
+            area_id = self._area_id(entity_id)
+            if area_id is not None:
+                # The sensor saw the exact moment the area went inactive
+                self.engine.set_area_inactive_since(area_id, new_state.last_changed)
+
+        if self.engine.set_streaming(self._sensors_report_streaming()):
+            # Streaming stopped: run everything held back in one cleanup
+            self.hass.async_create_task(self._event_cleanup())
+
+    def _area_id(self, entity_id: str) -> str | None:
+        """Return the hub resource id behind an entertainment area sensor."""
+        from homeassistant.helpers import entity_registry
+
+        entry = entity_registry.async_get(self.hass).async_get(entity_id)
+        return entry.unique_id if entry is not None else None
+
+    def _sensors_report_streaming(self) -> bool:
+        """Return True if any tracked entertainment area is streaming."""
+        for entity_id in self._entertainment_area_entities:
+            state = self.hass.states.get(entity_id)
+            if state is not None and state.state == "on":
+                return True
+        return False
+
     async def _delayed_cleanup(self) -> None:
         """Perform cleanup after a delay."""
         await asyncio.sleep(DEFAULT_CLEANUP_DELAY)  # Wait for the area to be fully created
-        await self._clean_entertainment_areas()
+        await self._event_cleanup()
+
+    async def _event_cleanup(self) -> None:
+        """Run an event-driven cleanup; the next poll reports persistent errors."""
+        try:
+            await self._clean_resources(priority=PRIORITY_EVENT)
+        except Exception as err:
+            _LOGGER.warning(f"Event-driven cleanup failed: {err}")
 
     async def _async_update_data(self):
         """Update data via library."""
@@ -106,12 +180,13 @@ class HueCleanerCoordinator(DataUpdateCoordinator):
             _LOGGER.debug(f"Running cleanup in {mode} mode")
 
             # Clean entertainment areas
-            cleaned = await self._clean_entertainment_areas()
+            snapshots = self.engine.snapshot_count
+            cleaned = await self._clean_resources(priority=PRIORITY_POLL)
 
-            # Reset connection issues on successful operation
-            if cleaned >= 0:
-                self._connection_issues = 0
-                await self._clear_repair_issues()
+            # Only a request the hub answered proves the connection is back,
+            # a cleanup held by the streaming sensors never reaches it
+            if self.engine.snapshot_count > snapshots:
+                self._handle_success()
 
             return {
                 "cleaned_count": self.cleaned_count,
@@ -120,6 +195,8 @@ class HueCleanerCoordinator(DataUpdateCoordinator):
                 "hue_ip": self.hue_ip,
                 "status": "active" if cleaned >= 0 else "error",
                 "mode": mode,
+                "streaming": self.engine.streaming,
+                "health": self._health,
             }
         except Exception as err:
             # Handle specific error types
@@ -133,156 +210,168 @@ class HueCleanerCoordinator(DataUpdateCoordinator):
 
             raise UpdateFailed(f"Error communicating with Hue Hub: {err}")
 
-    async def async_manual_clean(self, include_active: bool = False) -> int:
+    async def async_manual_clean(
+        self, include_active: bool = False, collectors: list[str] | None = None
+    ) -> int:
         """Manually trigger a cleanup (can include active areas).
 
         Args:
-            include_active: If True, also clean active areas. If False, only inactive.
+            include_active: If True, also clean active areas and ignore streaming.
+                If False, only inactive and deferred while streaming.
+            collectors: Keys of the collectors to run, defaults to entertainment areas.
         """
         _LOGGER.info(
-            f"Manual cleanup triggered (include_active={include_active})")
-        cleaned = await self._clean_entertainment_areas(include_active=include_active)
-        if cleaned > 0:
-            self.cleaned_count += cleaned
-            self.last_clean = datetime.now()
+            f"Manual cleanup triggered (include_active={include_active}, collectors={collectors})")
+        cleaned = await self._clean_resources(
+            include_active=include_active,
+            priority=PRIORITY_MANUAL,
+            collectors=collectors,
+            force=include_active,
+        )
         await self.async_request_refresh()
         return cleaned
 
-    async def _clean_entertainment_areas(self, include_active: bool = False) -> int:
-        """Clean up entertainment areas.
-
-        Args:
-            include_active: If True, also clean active areas. If False, only inactive.
-        """
-        try:
-            # Get entertainment areas
-            areas = await self._get_entertainment_areas()
-            _LOGGER.debug(
-                f"Got {len(areas) if areas else 0} entertainment areas from hub")
-            if not areas:
-                return 0
-
-            # Filter areas with the pattern (using includes like original Tauri app)
-            if include_active:
-                # Clean ALL areas matching the pattern, regardless of status
-                trash_areas = [
-                    area
-                    for area in areas
-                    if ENTERTAINMENT_AREA_NAME_PATTERN in area.get("name", "")
-                ]
-                _LOGGER.warning(
-                    f"Cleaning ALL areas including active: {[a.get('name') for a in trash_areas]}")
-            else:
-                # Only clean inactive areas (default behavior)
-                trash_areas = [
-                    area
-                    for area in areas
-                    if (
-                        ENTERTAINMENT_AREA_NAME_PATTERN in area.get("name", "")
-                        and ENTERTAINMENT_AREA_INACTIVE_STATUS in area.get("status", "")
-                    )
-                ]
-
-            _LOGGER.debug(
-                f"Found {len(trash_areas)} trash areas to clean: {[a.get('name') for a in trash_areas]}")
-            if not trash_areas:
-                return 0
-
-            # Delete each area
-            cleaned = 0
-            for area in trash_areas:
-                if await self._delete_entertainment_area(area["id"]):
-                    cleaned += 1
-                    # Small delay to avoid overwhelming the hub
-                    await asyncio.sleep(0.5)
-
-            # Update counters
-            self.cleaned_count += cleaned
-            self.last_clean = datetime.now()
-
-            _LOGGER.info(f"Cleaned {cleaned} entertainment areas")
-            return cleaned
-
-        except Exception as err:
-            _LOGGER.error(f"Error cleaning entertainment areas: {err}")
-            raise
+    async def async_plan(
+        self, include_active: bool = False, collectors: list[str] | None = None
+    ) -> dict:
+        """Return what a manual cleanup would delete, cached as a plan."""
+        plan = await self.engine.async_plan(
+            include_active=include_active, collectors=collectors)
+        return {"hue_ip": self.hue_ip, **plan.as_dict()}
+
+    def has_plan(self, plan_id: str) -> bool:
+        """Return True if this hub holds the plan."""
+        return self.engine.has_plan(plan_id)
+
+    async def async_execute_plan(self, plan_id: str) -> dict:
+        """Delete the resources of a cached plan."""
+        _LOGGER.info(f"Executing cleanup plan {plan_id}")
+        result = await self.engine.async_execute_plan(plan_id)
+        if result["cleaned"]:
+            self.async_update_listeners()
+        return {"hue_ip": self.hue_ip, **result}
+
+    async def _clean_resources(
+        self,
+        include_active: bool = False,
+        priority: int = PRIORITY_POLL,
+        collectors: list[str] | None = None,
+        force: bool = False,
+    ) -> int:
+        """Run a cleanup through the engine and refresh the entities."""
+        if (
+            self._entertainment_area_entities
+            and self._sensors_report_streaming()
+            and not force
+        ):
+            # The binary sensors say we are streaming, skip even the GET
+            self.engine.defer()
+            return 0
+
+        cleaned = await self.engine.async_clean(
+            include_active=include_active,
+            priority=priority,
+            collectors=collectors,
+            force=force,
+        )
+        if self.engine.has_deferred and not self._entertainment_area_entities:
+            self._schedule_streaming_recheck()
+        if cleaned:
+            self.async_update_listeners()
+        return cleaned
 
-    async def _get_entertainment_areas(self) -> list[dict]:
-        """Get all entertainment areas from Hue Hub."""
-        try:
-            session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=10),
-                connector=aiohttp.TCPConnector(ssl=False)
-            )
+    def _schedule_streaming_recheck(self) -> None:
+        """Poll again soon while cleanups are held and no sensor will tell us."""
+        if self._unsub_streaming_recheck is not None:
+            return
+        from homeassistant.helpers.event import async_call_later
 
-            url = HUE_ENTERTAINMENT_API.format(ip=self.hue_ip)
-            headers = {"hue-application-key": self.api_key}
-
-            async with session.get(url, headers=headers) as response:
-                response_text = await response.text()
-                _LOGGER.debug(
-                    f"Entertainment areas response: status={response.status}, body={response_text[:200]}")
-                if response.status == 200:
-                    data = await response.json()
-                    return data.get("data", [])
-                else:
-                    _LOGGER.error(
-                        f"Failed to get entertainment areas: {response.status}, response={response_text}")
-                    return []
-        except Exception as err:
-            _LOGGER.error(f"Error getting entertainment areas: {err}")
-            return []
-        finally:
-            await session.close()
+        _LOGGER.debug(
+            f"Rechecking streaming on {self.hue_ip} in {STREAMING_RECHECK_INTERVAL}s")
+        self._unsub_streaming_recheck = async_call_later(
+            self.hass, STREAMING_RECHECK_INTERVAL, self._async_streaming_recheck)
 
-    async def _delete_entertainment_area(self, area_id: str) -> bool:
-        """Delete a specific entertainment area."""
-        try:
-            session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=10),
-                connector=aiohttp.TCPConnector(ssl=False)
-            )
+    async def _async_streaming_recheck(self, _now) -> None:
+        """Drain held cleanups if streaming stopped, otherwise check again later."""
+        self._unsub_streaming_recheck = None
+        await self._event_cleanup()
 
-            url = f"{HUE_ENTERTAINMENT_API.format(ip=self.hue_ip)}/{area_id}"
-            headers = {"hue-application-key": self.api_key}
-
-            async with session.delete(url, headers=headers) as response:
-                success = response.status in [200, 204]
-                if success:
-                    _LOGGER.debug(f"Deleted entertainment area {area_id}")
-                else:
-                    _LOGGER.warning(
-                        f"Failed to delete area {area_id}: {response.status}")
-                return success
-        except Exception as err:
-            _LOGGER.error(
-                f"Error deleting entertainment area {area_id}: {err}")
-            return False
-        finally:
-            await session.close()
+    def _on_area_cleaned(self, event_data: dict) -> None:
+        """Fire an event for each deleted entertainment area."""
+        self.hass.bus.async_fire(EVENT_AREA_CLEANED, event_data)
 
     async def async_shutdown(self) -> None:
         """Clean up trackers when coordinator is shut down."""
         for unsubscribe in self._unsubscribe_trackers:
             unsubscribe()
         self._unsubscribe_trackers.clear()
+        if self._unsub_streaming_recheck is not None:
+            self._unsub_streaming_recheck()
+            self._unsub_streaming_recheck = None
+        await self.engine.async_shutdown()
+        # Stop scheduled refreshes too
+        await super().async_shutdown()
+
+    def _issue_id(self, error_type: str) -> str:
+        """Return the repair issue and notification id for an error type."""
+        return f"hue_cleaner_{error_type}_{self.hue_ip}"
+
+    def load_open_issues(self) -> None:
+        """Pick up issues persisted by a previous run so they can be closed."""
+        from homeassistant.helpers import issue_registry
+
+        registry = issue_registry.async_get(self.hass)
+        for error_type in ERROR_TYPES:
+            issue_id = self._issue_id(error_type)
+            if registry.async_get_issue(DOMAIN, issue_id) is not None:
+                self._open_issues.add(issue_id)
+
+    def _handle_success(self) -> None:
+        """Reset the failure counter and close issues if we were unhealthy."""
+        self._connection_issues = 0
+        if self._health != HEALTH_OK or self._open_issues:
+            self._set_health(HEALTH_OK)
 
     async def _handle_connection_error(self, error_type: str, error_message: str) -> None:
         """Handle connection errors and create notifications/issues."""
         self._connection_issues += 1
 
-        if self._connection_issues >= self._max_connection_issues:
-            # Create persistent notification
-            await self._create_error_notification(error_type, error_message)
-
-            # Create repair issue
-            await self._create_repair_issue(error_type, error_message)
-
-            # Reset counter to avoid spam
-            self._connection_issues = 0
-
-    async def _create_error_notification(self, error_type: str, error_message: str) -> None:
+        # Only report once the failure is persistent and new
+        if self._connection_issues < self._max_connection_issues:
+            return
+        if self._health == error_type:
+            return
+        self._set_health(error_type, error_message)
+
+    def _set_health(self, health: str, error_message: str = "") -> None:
+        """Move to a new health state, touching the registries only here."""
+        _LOGGER.info(f"Hue Hub {self.hue_ip} health changed: {self._health} -> {health}")
+        self._health = health
+        new_issue_id = None if health == HEALTH_OK else self._issue_id(health)
+
+        for issue_id in list(self._open_issues):
+            if issue_id != new_issue_id:
+                self._close_issue(issue_id)
+                self._open_issues.discard(issue_id)
+
+        if new_issue_id is not None and new_issue_id not in self._open_issues:
+            self._create_error_notification(health, error_message)
+            self._create_repair_issue(health, error_message)
+            self._open_issues.add(new_issue_id)
+
+    def _close_issue(self, issue_id: str) -> None:
+        """Delete a repair issue and dismiss its notification."""
+        # Imported on first transition, most setups never get here
+        from homeassistant.components import persistent_notification
+        from homeassistant.helpers import issue_registry
+
+        issue_registry.async_delete_issue(self.hass, DOMAIN, issue_id)
+        persistent_notification.async_dismiss(self.hass, issue_id)
+
+    def _create_error_notification(self, error_type: str, error_message: str) -> None:
         """Create a persistent notification for connection errors."""
+        from homeassistant.components import persistent_notification
+
         if error_type == "ip_change":
             title = "Hue Cleaner: Hub IP Changed"
             message = f"The Hue Hub IP address has changed. Please reconfigure the integration.\n\nOriginal IP: {self.hue_ip}\nError: {error_message}"
@@ -293,42 +382,27 @@ class HueCleanerCoordinator(DataUpdateCoordinator):
             title = "Hue Cleaner: Connection Error"
             message = f"Unable to connect to Hue Hub.\n\nError: {error_message}"
 
-        persistent_notification.create(
+        persistent_notification.async_create(
             self.hass,
             message,
             title=title,
-            notification_id=f"hue_cleaner_{error_type}_{self.hue_ip}"
+            notification_id=self._issue_id(error_type)
         )
 
-    async def _create_repair_issue(self, error_type: str, error_message: str) -> None:
+    def _create_repair_issue(self, error_type: str, error_message: str) -> None:
         """Create a repair issue in the settings."""
-        if error_type == "ip_change":
-            issue_id = f"hue_cleaner_ip_change_{self.hue_ip}"
-        elif error_type == "api_key_expired":
-            issue_id = f"hue_cleaner_api_key_expired_{self.hue_ip}"
-        else:
-            issue_id = f"hue_cleaner_connection_error_{self.hue_ip}"
+        from homeassistant.helpers import issue_registry
 
-        async_create_issue(
+        issue_registry.async_create_issue(
             self.hass,
             domain=DOMAIN,
-            issue_id=issue_id,
+            issue_id=self._issue_id(error_type),
             is_fixable=True,
             is_persistent=True,
-            severity=IssueSeverity.ERROR,
+            severity=issue_registry.IssueSeverity.ERROR,
             translation_key=error_type,
             translation_placeholders={
                 "hue_ip": self.hue_ip,
                 "error_message": error_message
             }
         )
-
-    async def _clear_repair_issues(self) -> None:
-        """Clear all repair issues for this integration."""
-        # Try to delete common issue IDs
-        for error_type in ["ip_change", "api_key_expired", "connection_error"]:
-            issue_id = f"hue_cleaner_{error_type}_{self.hue_ip}"
-            try:
-                async_delete_issue(self.hass, domain=DOMAIN, issue_id=issue_id)
-            except Exception:
-                pass  # Issue doesn't exist, ignore
@@ -0,0 +1,173 @@
+"""Standalone daemon running the Hue Cleaner engine without Home Assistant.
+
+Serves any number of Hue Hubs from a single event loop:
+
+    python -m custom_components.hue_cleaner.daemon --config hue_cleaner.json
+
+The config file is JSON:
+
+    {
+      "interval": 3600,
+      "metrics_port": 9464,
+      "bridges": [
+        {"host": "192.168.0.100", "api_key": "..."}
+      ]
+    }
+
+When `metrics_port` is set, Prometheus metrics are served on /metrics.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import signal
+
+import aiohttp
+
+from .const import (
+    DEFAULT_METRICS_PORT,
+    DEFAULT_SCAN_INTERVAL,
+    PRIORITY_POLL,
+    STREAMING_RECHECK_INTERVAL,
+)
+from .engine import HueCleanerEngine
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def load_config(path: str) -> dict:
+    """Read and validate the daemon config file."""
+    with open(path, encoding="utf-8") as config_file:
+        config = json.load(config_file)
+
+    bridges = config.get("bridges")
+    if not bridges:
+        raise ValueError("Config must list at least one bridge")
+    for bridge in bridges:
+        if not bridge.get("host") or not bridge.get("api_key"):
+            raise ValueError(f"Bridge entry needs host and api_key: {bridge}")
+
+    config.setdefault("interval", DEFAULT_SCAN_INTERVAL)
+    config.setdefault("metrics_port", DEFAULT_METRICS_PORT)
+    return config
+
+
+def render_metrics(engines: list[HueCleanerEngine]) -> str:
+    """Render engine statistics in the Prometheus text format."""
+    lines = [
+        "# TYPE hue_cleaner_cleaned_total counter",
+        "# TYPE hue_cleaner_cleanup_latency_seconds summary",
+        "# TYPE hue_cleaner_queue_wait_ms summary",
+        "# TYPE hue_cleaner_merged_requests_total counter",
+        "# TYPE hue_cleaner_orphans gauge",
+        "# TYPE hue_cleaner_streaming gauge",
+        "# TYPE hue_cleaner_deferred_cleanups_total counter",
+        "# TYPE hue_cleaner_max_loop_block_ms gauge",
+    ]
+    for engine in engines:
+        bridge = f'bridge="{engine.hue_ip}"'
+        lines.append(f"hue_cleaner_cleaned_total{{{bridge}}} {engine.cleaned_count}")
+        for quantile in (50, 95):
+            latency = engine.cleanup_latency.percentile(quantile)
+            if latency is not None:
+                lines.append(
+                    f'hue_cleaner_cleanup_latency_seconds{{{bridge},quantile="{quantile / 100}"}} {latency}')
+            wait = engine.scheduler.queue_wait.percentile(quantile)
+            if wait is not None:
+                lines.append(
+                    f'hue_cleaner_queue_wait_ms{{{bridge},quantile="{quantile / 100}"}} {wait}')
+        lines.append(
+            f"hue_cleaner_merged_requests_total{{{bridge}}} {engine.scheduler.merged_count}")
+        lines.append(f"hue_cleaner_streaming{{{bridge}}} {int(engine.streaming)}")
+        lines.append(
+            f"hue_cleaner_deferred_cleanups_total{{{bridge}}} {engine.deferral_count}")
+        if engine.loop_block.max is not None:
+            lines.append(f"hue_cleaner_max_loop_block_ms{{{bridge}}} {engine.loop_block.max}")
+        for collector, count in engine.orphan_counts.items():
+            lines.append(
+                f'hue_cleaner_orphans{{{bridge},collector="{collector}"}} {count}')
+    return "\n".join(lines) + "\n"
+
+
+async def _async_start_metrics(engines: list[HueCleanerEngine], port: int):
+    """Serve /metrics and return the runner so it can be stopped."""
+    # Only pay for aiohttp.web when metrics are enabled
+    from aiohttp import web
+
+    async def metrics(request: web.Request) -> web.Response:
+        return web.Response(text=render_metrics(engines), content_type="text/plain")
+
+    app = web.Application()
+    app.router.add_get("/metrics", metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, port=port).start()
+    _LOGGER.info(f"Serving metrics on port {port}")
+    return runner
+
+
+async def _async_clean_forever(engine: HueCleanerEngine, interval: int) -> None:
+    """Clean one hub on a fixed interval."""
+    while True:
+        try:
+            await engine.async_clean(priority=PRIORITY_POLL)
+        except Exception as err:
+            _LOGGER.error(f"Cleanup failed for {engine.hue_ip}: {err}")
+        # Look again soon so held cleanups drain right after streaming stops
+        await asyncio.sleep(
+            STREAMING_RECHECK_INTERVAL if engine.has_deferred else interval)
+
+
+async def async_run(config: dict) -> None:
+    """Run every configured hub until cancelled."""
+    connector = aiohttp.TCPConnector(ssl=False)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        engines = [
+            HueCleanerEngine(bridge["host"], bridge["api_key"], session)
+            for bridge in config["bridges"]
+        ]
+        runner = None
+        if config["metrics_port"]:
+            runner = await _async_start_metrics(engines, config["metrics_port"])
+
+        _LOGGER.info(f"Hue Cleaner daemon started for {len(engines)} bridges")
+        try:
+            await asyncio.gather(
+                *(_async_clean_forever(engine, config["interval"]) for engine in engines))
+        finally:
+            for engine in engines:
+                await engine.async_shutdown()
+            if runner is not None:
+                await runner.cleanup()
+
+
+async def _async_main(config: dict) -> None:
+    """Run the daemon and stop cleanly on SIGTERM or SIGINT."""
+    task = asyncio.current_task()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, task.cancel)
+    try:
+        await async_run(config)
+    except asyncio.CancelledError:
+        _LOGGER.info("Hue Cleaner daemon stopped")
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Headless Hue Cleaner daemon")
+    parser.add_argument("--config", required=True, help="Path to the JSON config file")
+    parser.add_argument("--log-level", default="INFO", help="Logging level")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=args.log_level.upper(),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+    asyncio.run(_async_main(load_config(args.config)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,562 @@
+"""Home Assistant independent cleaning engine for Hue Cleaner.
+
+The engine owns everything needed to fetch, filter and delete resources on a
+single Hue Hub. It only depends on aiohttp so that it can run both inside
+`HueCleanerCoordinator` and in the standalone daemon.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import aiohttp
+
+from .collectors import COLLECTORS, EntertainmentAreaCollector
+from .const import (
+    DEFAULT_COLLECTORS,
+    DEFAULT_DELETE_LATENCY,
+    DELETE_INTERVAL,
+    ENTERTAINMENT_AREA_ACTIVE_STATUS,
+    ENTERTAINMENT_AREA_INACTIVE_STATUS,
+    ENTERTAINMENT_CONFIGURATION,
+    HUE_RESOURCE_API,
+    LARGE_PAYLOAD_THRESHOLD,
+    LATENCY_SAMPLE_SIZE,
+    LOOP_BLOCK_WARNING_MS,
+    PRIORITY_MANUAL,
+    PRIORITY_POLL,
+)
+from .index import BridgeResourceIndex
+from .plan import CleanupPlan
+from .scheduler import HueRequestScheduler
+from .stats import RollingStats
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class HueCleanerError(Exception):
+    """Error talking to the Hue Hub."""
+
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+def _skip(text: str, pos: int, expected: str | None = None) -> int:
+    """Skip whitespace and optionally one expected character.
+
+    Raises json.JSONDecodeError, like json.loads, if the text ends first or
+    the expected character is missing.
+    """
+    while pos < len(text) and text[pos] in _WHITESPACE:
+        pos += 1
+    if pos >= len(text):
+        raise json.JSONDecodeError("Unexpected end of snapshot", text, pos)
+    if expected is not None:
+        if text[pos] != expected:
+            raise json.JSONDecodeError(f"Expecting {expected!r}", text, pos)
+        pos += 1
+    return pos
+
+
+def _expect_end(text: str, pos: int) -> None:
+    """Raise like json.loads if anything but whitespace follows the document."""
+    if text[pos:].strip(_WHITESPACE):
+        raise json.JSONDecodeError("Extra data", text, pos)
+
+
+def _decode_resources_incrementally(body: bytes) -> list[dict]:
+    """Decode the "data" array of a snapshot one resource at a time.
+
+    json.loads holds the GIL for the whole document, which stalls the event
+    loop even from an executor thread. Decoding each resource separately lets
+    the loop thread run in between.
+    """
+    text = body.decode()
+    resources: list[dict] = []
+    pos = _skip(text, 0, "{")
+    if text[_skip(text, pos)] == "}":
+        _expect_end(text, _skip(text, pos, "}"))
+        return resources
+    while True:
+        pos = _skip(text, pos)
+        if text[pos] != '"':
+            raise json.JSONDecodeError("Expecting property name", text, pos)
+        key, pos = _DECODER.raw_decode(text, pos)
+        pos = _skip(text, pos, ":")
+        if key != "data":
+            _, pos = _DECODER.raw_decode(text, _skip(text, pos))
+        else:
+            pos = _skip(text, pos, "[")
+            if text[_skip(text, pos)] == "]":
+                pos = _skip(text, pos, "]")
+            else:
+                while True:
+                    resource, pos = _DECODER.raw_decode(text, _skip(text, pos))
+                    resources.append(resource)
+                    pos = _skip(text, pos)
+                    if text[pos] == "]":
+                        pos += 1
+                        break
+                    pos = _skip(text, pos, ",")
+        pos = _skip(text, pos)
+        if text[pos] == "}":
+            _expect_end(text, pos + 1)
+            return resources
+        pos = _skip(text, pos, ",")
+
+
+def _fingerprint(areas: list[dict], findings: dict[str, list[dict]]) -> str:
+    """Summarize the parts of a snapshot that a cleanup plan depends on.
+
+    Entertainment area findings follow from the areas themselves, so they are
+    left out and plans with or without active areas share one fingerprint.
+    """
+    parts = sorted(
+        f"{area.get('id')}:{area.get('name')}:{area.get('status')}" for area in areas)
+    parts += sorted(
+        f"{key}:{resource['id']}"
+        for key, found in findings.items()
+        if key != EntertainmentAreaCollector.key
+        for resource in found
+    )
+    return hashlib.sha1("\n".join(parts).encode()).hexdigest()[:16]
+
+
+def _parse_snapshot(
+    body: bytes, include_active: bool, incremental: bool = False
+) -> tuple[BridgeResourceIndex, dict[str, list[dict]]]:
+    """Decode a resource snapshot and run every collector over it.
+
+    Pure CPU work with no shared state, so it is safe to run in an executor.
+    """
+    if incremental:
+        resources = _decode_resources_incrementally(body)
+    else:
+        resources = json.loads(body).get("data", [])
+    index = BridgeResourceIndex(resources)
+    findings = {
+        key: collector_class(include_active=include_active).find(index)
+        for key, collector_class in COLLECTORS.items()
+    }
+    return index, findings
+
+
+class HueCleanerEngine:
+    """Fetch, filter and delete orphaned resources on one Hue Hub."""
+
+    def __init__(
+        self,
+        hue_ip: str,
+        api_key: str,
+        session: aiohttp.ClientSession,
+        on_area_cleaned: Callable[[dict], None] | None = None,
+        large_payload_threshold: int = LARGE_PAYLOAD_THRESHOLD,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            hue_ip: Address of the Hue Hub.
+            api_key: Application key used for every request.
+            session: HTTP session the scheduler sends requests through.
+            on_area_cleaned: Called with the event data of each deleted area.
+            large_payload_threshold: Snapshots of at least this many bytes are
+                parsed in an executor instead of on the event loop.
+        """
+        self.hue_ip = hue_ip
+        self.api_key = api_key
+        self.cleaned_count = 0
+        self.last_clean = None
+        self._on_area_cleaned = on_area_cleaned
+        # Lifecycle of each area seen on the hub, keyed by area id
+        self._area_first_seen: dict[str, datetime] = {}
+        self._area_last_active: dict[str, datetime] = {}
+        self._area_inactive_since: dict[str, datetime] = {}
+        self.cleanup_latency = RollingStats(LATENCY_SAMPLE_SIZE)
+        # Orphans found per collector in the last cycle
+        self.orphan_counts: dict[str, int] = {}
+        # All hub I/O goes through this scheduler
+        self.scheduler = HueRequestScheduler(session)
+        self.snapshot_count = 0
+        # Cleanups are held while an entertainment area is streaming
+        self.streaming = False
+        self.deferral_count = 0
+        self.deferral_duration = RollingStats(LATENCY_SAMPLE_SIZE)
+        self._deferred_since: float | None = None
+        # How long our own synchronous work held the event loop, in ms
+        self.large_payload_threshold = large_payload_threshold
+        self.loop_block = RollingStats(LATENCY_SAMPLE_SIZE)
+        # Cached cleanup plans and what they were validated against
+        self.delete_latency = RollingStats(LATENCY_SAMPLE_SIZE)
+        self.snapshot_fingerprint: str | None = None
+        self._plans: dict[str, CleanupPlan] = {}
+        # Ids being deleted, so overlapping cleanups never delete twice
+        self._deleting: set[str] = set()
+
+    @contextmanager
+    def _measure_loop_block(self, what: str) -> Iterator[None]:
+        """Record how long a synchronous section keeps the event loop busy."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            blocked_ms = (time.perf_counter() - started) * 1000
+            self.loop_block.add(blocked_ms)
+            if blocked_ms >= LOOP_BLOCK_WARNING_MS:
+                _LOGGER.warning(
+                    f"{what} blocked the event loop for {blocked_ms:.0f} ms on {self.hue_ip}")
+
+    def set_streaming(self, streaming: bool) -> bool:
+        """Update the streaming state from an outside source.
+
+        Returns True when streaming just stopped with cleanups held back, so
+        the caller should run one cleanup to drain them.
+        """
+        was_streaming = self.streaming
+        self.streaming = streaming
+        if streaming and not was_streaming:
+            _LOGGER.info(f"Streaming started on {self.hue_ip}, deferring cleanups")
+        return was_streaming and not streaming and self.has_deferred
+
+    @property
+    def has_deferred(self) -> bool:
+        """Return True while cleanups are held back."""
+        return self._deferred_since is not None
+
+    def defer(self) -> None:
+        """Hold back a cleanup until streaming stops."""
+        self.deferral_count += 1
+        if self._deferred_since is None:
+            self._deferred_since = time.monotonic()
+        _LOGGER.debug(f"Cleanup on {self.hue_ip} deferred while streaming")
+
+    def _end_deferral(self) -> None:
+        """Record how long cleanups were held back."""
+        if self._deferred_since is None:
+            return
+        duration = time.monotonic() - self._deferred_since
+        self._deferred_since = None
+        self.deferral_duration.add(duration)
+        _LOGGER.info(
+            f"Draining cleanups deferred for {duration:.0f}s on {self.hue_ip}")
+
+    async def async_clean(
+        self,
+        include_active: bool = False,
+        priority: int = PRIORITY_POLL,
+        collectors: list[str] | None = None,
+        force: bool = False,
+    ) -> int:
+        """Clean up orphaned resources found by the enabled collectors.
+
+        Args:
+            include_active: If True, also clean active areas. If False, only inactive.
+            priority: Scheduler priority for the requests sent to the hub.
+            collectors: Keys of the collectors whose findings are deleted.
+            force: If True, delete even while an entertainment area is streaming.
+        """
+        try:
+            trash = await self._async_select(priority, include_active, collectors)
+            if include_active:
+                _LOGGER.warning(
+                    f"Cleaning ALL areas including active: {[r.get('name') for r in trash.values()]}")
+            drains = set(DEFAULT_COLLECTORS).issubset(collectors or DEFAULT_COLLECTORS)
+            return await self._async_delete_all(
+                list(trash.values()), priority, force, drains)
+
+        except Exception as err:
+            _LOGGER.error(f"Error cleaning resources: {err}")
+            raise
+
+    async def async_plan(
+        self,
+        include_active: bool = False,
+        collectors: list[str] | None = None,
+        priority: int = PRIORITY_MANUAL,
+    ) -> CleanupPlan:
+        """Work out what a cleanup would delete and cache it as a plan."""
+        self._purge_expired_plans()
+        trash = await self._async_select(priority, include_active, collectors)
+        plan = CleanupPlan(
+            list(trash.values()),
+            self.snapshot_fingerprint,
+            include_active,
+            collectors,
+            self.estimate_duration(len(trash)),
+        )
+        self._plans[plan.plan_id] = plan
+        _LOGGER.info(
+            f"Planned deletion of {len(trash)} resources on {self.hue_ip} as {plan.plan_id}")
+        return plan
+
+    def has_plan(self, plan_id: str) -> bool:
+        """Return True if the plan is cached and not expired."""
+        self._purge_expired_plans()
+        return plan_id in self._plans
+
+    async def async_execute_plan(
+        self, plan_id: str, priority: int = PRIORITY_MANUAL
+    ) -> dict:
+        """Delete exactly the resources of a cached plan.
+
+        The hub is only queried again if the snapshot fingerprint changed
+        since planning, and then only planned resources that are still
+        garbage are deleted.
+        """
+        self._purge_expired_plans()
+        plan = self._plans.pop(plan_id, None)
+        if plan is None:
+            raise HueCleanerError(f"Unknown or expired plan {plan_id}")
+
+        resources = plan.resources
+        revalidated = plan.fingerprint is None or plan.fingerprint != self.snapshot_fingerprint
+        if revalidated:
+            _LOGGER.info(f"Hub {self.hue_ip} changed since plan {plan_id}, revalidating")
+            current = await self._async_select(
+                priority, plan.include_active, plan.collectors)
+            resources = [r for r in plan.resources if r["id"] in current]
+
+        deferrals = self.deferral_count
+        cleaned = await self._async_delete_all(
+            resources, priority, plan.include_active, drains=False)
+        deferred = self.deferral_count > deferrals
+        if deferred:
+            # Keep the plan so it can be executed once streaming stops
+            self._plans[plan_id] = plan
+
+        return {
+            "plan_id": plan_id,
+            "planned": len(plan.resources),
+            "cleaned": cleaned,
+            "revalidated": revalidated,
+            "deferred": deferred,
+        }
+
+    def estimate_duration(self, count: int) -> float:
+        """Estimate how many seconds deleting `count` resources takes."""
+        latency = self.delete_latency.percentile(50)
+        if latency is None:
+            latency = DEFAULT_DELETE_LATENCY
+        return count * (latency + DELETE_INTERVAL)
+
+    def invalidate_snapshot(self) -> None:
+        """Mark the last snapshot as stale, e.g. after a hub state change."""
+        self.snapshot_fingerprint = None
+
+    def _purge_expired_plans(self) -> None:
+        """Drop plans past their expiry."""
+        for plan_id in [p for p, plan in self._plans.items() if plan.expired]:
+            del self._plans[plan_id]
+
+    async def _async_select(
+        self, priority: int, include_active: bool, collectors: list[str] | None
+    ) -> dict[str, dict]:
+        """Fetch a snapshot, update tracking and return the resources to delete."""
+        enabled = collectors or DEFAULT_COLLECTORS
+
+        # One bulk fetch per cycle, shared by every collector
+        index, findings = await self.async_get_snapshot(priority, include_active)
+        areas = index.of_type(ENTERTAINMENT_CONFIGURATION)
+        _LOGGER.debug(
+            f"Got {len(index)} resources and {len(areas)} entertainment areas from hub")
+
+        with self._measure_loop_block("Area tracking"):
+            self._track_area_lifecycle(areas)
+            self.streaming = any(
+                area.get("status") == ENTERTAINMENT_AREA_ACTIVE_STATUS for area in areas)
+            self.snapshot_fingerprint = _fingerprint(areas, findings)
+
+            trash: dict[str, dict] = {}
+            for key, found in findings.items():
+                if key in enabled:
+                    trash.update((resource["id"], resource) for resource in found)
+            self.orphan_counts = {key: len(found) for key, found in findings.items()}
+
+        _LOGGER.debug(
+            f"Found {len(trash)} trash resources to clean: {self.orphan_counts}")
+        return trash
+
+    async def _async_delete_all(
+        self, resources: list[dict], priority: int, force: bool, drains: bool = True
+    ) -> int:
+        """Delete resources one by one, holding back while streaming.
+
+        Only a cleanup that covers everything a held one would delete, as
+        flagged by `drains`, ends the deferral; plans and collector subsets
+        leave the held work for the next full cleanup.
+        """
+        if not resources:
+            if drains:
+                self._end_deferral()
+            return 0
+
+        if self.streaming and not force:
+            self.defer()
+            return 0
+        if drains:
+            self._end_deferral()
+
+        # Delete each resource
+        cleaned = 0
+        for resource in resources:
+            if self.streaming and not force:
+                # Streaming started mid-burst, hold the rest back
+                self.defer()
+                break
+            if resource["id"] in self._deleting:
+                # An overlapping cleanup already owns this deletion
+                continue
+            self._deleting.add(resource["id"])
+            try:
+                deleted = await self.async_delete(resource, priority)
+            finally:
+                self._deleting.discard(resource["id"])
+            if deleted:
+                cleaned += 1
+                if resource["type"] == ENTERTAINMENT_CONFIGURATION:
+                    self._record_area_cleaned(resource)
+                # Small delay to avoid overwhelming the hub
+                await asyncio.sleep(DELETE_INTERVAL)
+
+        # Update counters
+        self.cleaned_count += cleaned
+        self.last_clean = datetime.now()
+
+        _LOGGER.info(f"Cleaned {cleaned} resources on {self.hue_ip}")
+        return cleaned
+
+    def set_area_inactive_since(self, area_id: str, when: datetime) -> None:
+        """Record an active -> inactive transition observed outside the engine."""
+        self._area_last_active.pop(area_id, None)
+        self._area_inactive_since[area_id] = when
+
+    def _track_area_lifecycle(self, areas: list[dict]) -> None:
+        """Record when each area was first seen and when it became inactive.
+
+        Inactivity only counts from an observed active -> inactive transition;
+        an area that was already inactive when first seen has no known start.
+        Snapshots only show that the transition happened since the previous
+        one, so the clock starts when the area was last seen active.
+        """
+        now = datetime.now(timezone.utc)
+        current_ids = set()
+        for area in areas:
+            area_id = area.get("id")
+            if not area_id:
+                continue
+            current_ids.add(area_id)
+            self._area_first_seen.setdefault(area_id, now)
+            if ENTERTAINMENT_AREA_INACTIVE_STATUS in area.get("status", ""):
+                last_active = self._area_last_active.pop(area_id, None)
+                if last_active is not None:
+                    self._area_inactive_since.setdefault(area_id, last_active)
+            else:
+                self._area_last_active[area_id] = now
+                self._area_inactive_since.pop(area_id, None)
+
+        # Forget areas that were removed from the hub by someone else
+        known = set(self._area_first_seen) | set(self._area_inactive_since)
+        for area_id in known - current_ids:
+            self._area_first_seen.pop(area_id, None)
+            self._area_last_active.pop(area_id, None)
+            self._area_inactive_since.pop(area_id, None)
+
+    def _record_area_cleaned(self, area: dict) -> None:
+        """Record detection-to-deletion latency and report the cleaned area."""
+        now = datetime.now(timezone.utc)
+        area_id = area["id"]
+        first_seen = self._area_first_seen.pop(area_id, None)
+        self._area_last_active.pop(area_id, None)
+        inactive_since = self._area_inactive_since.pop(area_id, None)
+
+        latency = None
+        if inactive_since is not None:
+            latency = (now - inactive_since).total_seconds()
+            self.cleanup_latency.add(latency)
+
+        if self._on_area_cleaned is not None:
+            self._on_area_cleaned(
+                {
+                    "hue_ip": self.hue_ip,
+                    "area_id": area_id,
+                    "name": area.get("name"),
+                    "first_seen": first_seen.isoformat() if first_seen else None,
+                    "inactive_since": inactive_since.isoformat() if inactive_since else None,
+                    "latency_seconds": latency,
+                }
+            )
+
+    async def async_get_snapshot(
+        self, priority: int = PRIORITY_POLL, include_active: bool = False
+    ) -> tuple[BridgeResourceIndex, dict[str, list[dict]]]:
+        """Get every resource from Hue Hub in one request and classify it.
+
+        Returns the resource index and the findings of every collector.
+        Raises so that connection and authentication problems reach the caller
+        instead of looking like a hub with nothing to clean.
+        """
+        try:
+            url = HUE_RESOURCE_API.format(ip=self.hue_ip)
+            headers = {"hue-application-key": self.api_key}
+
+            status, body = await self.scheduler.async_request(
+                "GET", url, headers, priority)
+            _LOGGER.debug(
+                f"Resources response: status={status}, size={len(body)}, body={body[:200]!r}")
+            if status != 200:
+                response_text = body.decode(errors="replace")
+                _LOGGER.error(
+                    f"Failed to get resources: {status}, response={response_text}")
+                raise HueCleanerError(f"Failed to get resources: {status} {response_text}")
+            self.snapshot_count += 1
+
+            if len(body) >= self.large_payload_threshold:
+                # Keep multi-megabyte decoding off the event loop
+                return await asyncio.get_running_loop().run_in_executor(
+                    None, _parse_snapshot, body, include_active, True)
+            with self._measure_loop_block("Snapshot parsing"):
+                return _parse_snapshot(body, include_active)
+        except Exception as err:
+            _LOGGER.error(f"Error getting resources: {err}")
+            raise
+
+    async def async_delete(
+        self, resource: dict, priority: int = PRIORITY_POLL
+    ) -> bool:
+        """Delete a specific resource."""
+        resource_id = resource["id"]
+        resource_type = resource["type"]
+        try:
+            url = f"{HUE_RESOURCE_API.format(ip=self.hue_ip)}/{resource_type}/{resource_id}"
+            headers = {"hue-application-key": self.api_key}
+
+            started = time.perf_counter()
+            status, _ = await self.scheduler.async_request(
+                "DELETE", url, headers, priority)
+            success = status in [200, 204]
+            if success:
+                self.delete_latency.add(time.perf_counter() - started)
+                # The hub no longer matches the last snapshot
+                self.invalidate_snapshot()
+                _LOGGER.debug(f"Deleted {resource_type} {resource_id}")
+            elif status == 404:
+                # Another cleanup already removed it
+                _LOGGER.debug(f"{resource_type} {resource_id} already deleted")
+            else:
+                _LOGGER.warning(
+                    f"Failed to delete {resource_type} {resource_id}: {status}")
+            return success
+        except Exception as err:
+            _LOGGER.error(
+                f"Error deleting {resource_type} {resource_id}: {err}")
+            return False
+
+    async def async_shutdown(self) -> None:
+        """Stop any outstanding hub I/O."""
+        await self.scheduler.async_shutdown()
@@ -0,0 +1,119 @@
+"""Shared per-bridge coordinators for Hue Cleaner integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from homeassistant import config_entries
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryNotReady
+
+from .const import DATA_HUBS, DOMAIN
+from .coordinator import HueCleanerCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class HueCleanerHub:
+    """A physical Hue Hub and the config entries that point at it."""
+
+    def __init__(
+        self, coordinator: HueCleanerCoordinator, bridge_id: str | None, host: str
+    ) -> None:
+        """Initialize."""
+        self.coordinator = coordinator
+        self.bridge_id = bridge_id
+        self.host = host
+        self.entry_ids: set[str] = set()
+
+    def matches(self, entry: ConfigEntry) -> bool:
+        """Return True if the entry points at this hub."""
+        if self.bridge_id and entry.unique_id:
+            return self.bridge_id == entry.unique_id
+        return self.host == entry.data[CONF_HOST]
+
+
+class HueCleanerHubRegistry:
+    """Reference-counted registry of hubs shared across config entries."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize."""
+        self.hass = hass
+        self._hubs: list[HueCleanerHub] = []
+        self._lock = asyncio.Lock()
+
+    @property
+    def coordinators(self) -> list[HueCleanerCoordinator]:
+        """Return one coordinator per physical hub."""
+        return [hub.coordinator for hub in self._hubs]
+
+    async def async_acquire(self, entry: ConfigEntry) -> HueCleanerCoordinator:
+        """Return the coordinator for the entry's hub, creating it if needed."""
+        async with self._lock:
+            hub = next((hub for hub in self._hubs if hub.matches(entry)), None)
+            if hub is None:
+                hub = await self._async_create_hub(entry)
+                self._hubs.append(hub)
+            else:
+                _LOGGER.info(
+                    f"Entry {entry.entry_id} shares the coordinator for hub {hub.host}")
+            hub.entry_ids.add(entry.entry_id)
+            return hub.coordinator
+
+    async def async_release(self, entry: ConfigEntry) -> None:
+        """Drop the entry's reference and shut the hub down when unused."""
+        async with self._lock:
+            for hub in self._hubs:
+                if entry.entry_id not in hub.entry_ids:
+                    continue
+                hub.entry_ids.discard(entry.entry_id)
+                if not hub.entry_ids:
+                    _LOGGER.debug(f"Last entry for hub {hub.host} unloaded")
+                    self._hubs.remove(hub)
+                    await hub.coordinator.async_shutdown()
+                return
+
+    async def _async_create_hub(self, entry: ConfigEntry) -> HueCleanerHub:
+        """Create and start a coordinator for a hub not seen before."""
+        # The coordinator outlives the entry that happens to create it, so it
+        # must not bind itself to that entry's unload hooks and reauth flow
+        token = config_entries.current_entry.set(None)
+        try:
+            coordinator = HueCleanerCoordinator(
+                self.hass,
+                entry.data[CONF_HOST],
+                entry.data["api_key"]
+            )
+        finally:
+            config_entries.current_entry.reset(token)
+
+        try:
+            # Known before the first update, so its success closes stale issues
+            coordinator.load_open_issues()
+
+            # Fetch initial data
+            _LOGGER.debug("Fetching initial data")
+            await coordinator.async_refresh()
+            if not coordinator.last_update_success:
+                raise ConfigEntryNotReady(
+                    f"Unable to reach Hue Hub {entry.data[CONF_HOST]}"
+                ) from coordinator.last_exception
+
+            # Start tracking entertainment area entities
+            _LOGGER.debug("Starting coordinator")
+            await coordinator.async_start()
+        except Exception:
+            await coordinator.async_shutdown()
+            raise
+
+        return HueCleanerHub(coordinator, entry.unique_id, entry.data[CONF_HOST])
+
+
+def async_get_registry(hass: HomeAssistant) -> HueCleanerHubRegistry:
+    """Return the domain-wide hub registry."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_HUBS not in domain_data:
+        domain_data[DATA_HUBS] = HueCleanerHubRegistry(hass)
+    return domain_data[DATA_HUBS]
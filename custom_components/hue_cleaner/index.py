@@ -0,0 +1,39 @@
+"""Index of Hue Hub resources for Hue Cleaner integration."""
+from __future__ import annotations
+
+
+class BridgeResourceIndex:
+    """All resources from one /clip/v2/resource snapshot, indexed for lookups.
+
+    Built in a single pass so that every collector can share it instead of
+    fetching its own resource type from the hub.
+    """
+
+    def __init__(self, resources: list[dict]) -> None:
+        """Initialize."""
+        self._by_type: dict[str, list[dict]] = {}
+        self._by_id: dict[str, dict] = {}
+
+        for resource in resources:
+            resource_id = resource.get("id")
+            resource_type = resource.get("type")
+            if not resource_id or not resource_type:
+                continue
+            self._by_type.setdefault(resource_type, []).append(resource)
+            self._by_id[resource_id] = resource
+
+    def __len__(self) -> int:
+        """Return the number of indexed resources."""
+        return len(self._by_id)
+
+    def of_type(self, resource_type: str) -> list[dict]:
+        """Return every resource of the given type."""
+        return self._by_type.get(resource_type, [])
+
+    def get(self, resource_id: str) -> dict | None:
+        """Return a resource by id."""
+        return self._by_id.get(resource_id)
+
+    def exists(self, resource_id: str) -> bool:
+        """Return True if the resource is on the hub."""
+        return resource_id in self._by_id
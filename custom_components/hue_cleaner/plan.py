@@ -0,0 +1,54 @@
+"""Cached cleanup plans for Hue Cleaner integration."""
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from .const import PLAN_TTL
+
+
+class CleanupPlan:
+    """Resources chosen for deletion, tied to the snapshot they came from."""
+
+    def __init__(
+        self,
+        resources: list[dict],
+        fingerprint: str | None,
+        include_active: bool,
+        collectors: list[str] | None,
+        estimated_duration: float,
+    ) -> None:
+        """Initialize."""
+        self.plan_id = uuid.uuid4().hex
+        self.resources = resources
+        self.fingerprint = fingerprint
+        self.include_active = include_active
+        self.collectors = collectors
+        self.estimated_duration = estimated_duration
+        self.created_at = datetime.now(timezone.utc)
+        self.expires_at = self.created_at + timedelta(seconds=PLAN_TTL)
+
+    @property
+    def expired(self) -> bool:
+        """Return True once the plan can no longer be executed."""
+        return datetime.now(timezone.utc) >= self.expires_at
+
+    def as_dict(self) -> dict:
+        """Return a JSON serializable summary of the plan."""
+        return {
+            "plan_id": self.plan_id,
+            "fingerprint": self.fingerprint,
+            "expires_at": self.expires_at.isoformat(),
+            "include_active": self.include_active,
+            "estimated_duration_seconds": round(self.estimated_duration, 1),
+            "resources": [
+                {
+                    "id": resource["id"],
+                    "type": resource["type"],
+                    "name": resource.get("name")
+                    or resource.get("metadata", {}).get("name"),
+                    "status": resource.get("status"),
+                }
+                for resource in self.resources
+            ],
+        }
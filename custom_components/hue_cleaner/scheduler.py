@@ -0,0 +1,152 @@
+"""Per-hub request scheduler for Hue Cleaner integration."""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+
+import aiohttp
+
+from .const import (
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_TIMEOUT,
+    LATENCY_SAMPLE_SIZE,
+)
+from .stats import RollingStats
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _PendingRequest:
+    """A request waiting in, or being served from, the scheduler queue."""
+
+    def __init__(
+        self,
+        key: tuple,
+        method: str,
+        url: str,
+        headers: dict,
+        priority: int,
+        future: asyncio.Future,
+    ) -> None:
+        """Initialize."""
+        self.key = key
+        self.method = method
+        self.url = url
+        self.headers = headers
+        self.priority = priority
+        self.future = future
+        self.enqueued = time.monotonic()
+        self.started = False
+
+
+class HueRequestScheduler:
+    """Run all requests for one Hue Hub through a single priority queue.
+
+    Requests with a lower priority value are served first, identical GET
+    requests that are still queued or in flight share one response, and at
+    most `max_concurrent` requests reach the hub at the same time.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+    ) -> None:
+        """Initialize."""
+        self._session = session
+        self._max_concurrent = max_concurrent
+        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._pending: dict[tuple, _PendingRequest] = {}
+        self._sequence = itertools.count()
+        self._workers: list[asyncio.Task] = []
+        self.queue_wait = RollingStats(LATENCY_SAMPLE_SIZE)
+        self.merged_count = 0
+
+    async def async_request(
+        self, method: str, url: str, headers: dict, priority: int
+    ) -> tuple[int, bytes]:
+        """Queue a request and return its status code and raw body."""
+        # Only GETs are safe to share; every other request has one owner
+        if method == "GET":
+            key: tuple = (method, url)
+        else:
+            key = (method, url, next(self._sequence))
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.merged_count += 1
+            _LOGGER.debug(f"Merged duplicate request {method} {url}")
+            if not pending.started and priority < pending.priority:
+                # Re-queue at the higher priority; the stale entry is skipped
+                pending.priority = priority
+                self._queue.put_nowait((priority, next(self._sequence), pending))
+        else:
+            future = asyncio.get_running_loop().create_future()
+            # Avoid "exception never retrieved" noise when every caller gave up
+            future.add_done_callback(
+                lambda fut: fut.cancelled() or fut.exception())
+            pending = _PendingRequest(key, method, url, headers, priority, future)
+            self._pending[pending.key] = pending
+            self._queue.put_nowait((priority, next(self._sequence), pending))
+            self._ensure_workers()
+
+        return await asyncio.shield(pending.future)
+
+    def _ensure_workers(self) -> None:
+        """Start the worker tasks on first use."""
+        if self._workers:
+            return
+        loop = asyncio.get_running_loop()
+        self._workers = [
+            loop.create_task(self._worker()) for _ in range(self._max_concurrent)
+        ]
+
+    async def _worker(self) -> None:
+        """Serve queued requests in priority order."""
+        while True:
+            _, _, pending = await self._queue.get()
+            try:
+                if pending.started:
+                    continue
+                pending.started = True
+                self.queue_wait.add((time.monotonic() - pending.enqueued) * 1000)
+                try:
+                    result = await self._execute(pending)
+                except asyncio.CancelledError:
+                    # Shut down mid-request, release everyone waiting on it
+                    pending.future.cancel()
+                    raise
+                except Exception as err:
+                    pending.future.set_exception(err)
+                else:
+                    pending.future.set_result(result)
+                finally:
+                    self._pending.pop(pending.key, None)
+            finally:
+                self._queue.task_done()
+
+    async def _execute(self, pending: _PendingRequest) -> tuple[int, bytes]:
+        """Send a single request to the hub.
+
+        The body is returned undecoded so that large payloads can be decoded
+        off the event loop.
+        """
+        async with self._session.request(
+            pending.method,
+            pending.url,
+            headers=pending.headers,
+            timeout=aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT),
+        ) as response:
+            return response.status, await response.read()
+
+    async def async_shutdown(self) -> None:
+        """Stop the workers and fail any request still waiting."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        for pending in self._pending.values():
+            if not pending.future.done():
+                pending.future.cancel()
+        self._pending.clear()
@@ -1,8 +1,13 @@
 """Sensor platform for Hue Cleaner integration."""
 from __future__ import annotations
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
@@ -18,7 +23,12 @@ async def async_setup_entry(
     """Set up Hue Cleaner sensor based on a config entry."""
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
 
-    async_add_entities([HueCleanerSensor(coordinator, config_entry)])
+    async_add_entities([
+        HueCleanerSensor(coordinator, config_entry),
+        HueCleanerLatencySensor(coordinator, config_entry, 50),
+        HueCleanerLatencySensor(coordinator, config_entry, 95),
+        HueCleanerLoopBlockSensor(coordinator, config_entry),
+    ])
 
 
 class HueCleanerSensor(CoordinatorEntity, SensorEntity):
@@ -61,4 +71,92 @@ class HueCleanerSensor(CoordinatorEntity, SensorEntity):
             "areas_cleaned_this_run": self.coordinator.data.get("areas_cleaned_this_run", 0),
             "hue_ip": self.coordinator.data.get("hue_ip"),
             "mode": self.coordinator.data.get("mode", "unknown"),
+            "health": self.coordinator.data.get("health", "unknown"),
+            "queue_wait_ms_p50": self.coordinator.scheduler.queue_wait.percentile(50),
+            "queue_wait_ms_p95": self.coordinator.scheduler.queue_wait.percentile(95),
+            "merged_requests": self.coordinator.scheduler.merged_count,
+            "orphans": self.coordinator.orphan_counts,
+            "streaming": self.coordinator.engine.streaming,
+            "deferred_cleanups": self.coordinator.engine.deferral_count,
+            "deferral_s_p50": self.coordinator.engine.deferral_duration.percentile(50),
+            "deferral_s_p95": self.coordinator.engine.deferral_duration.percentile(95),
+        }
+
+
+class HueCleanerLatencySensor(CoordinatorEntity, SensorEntity):
+    """Rolling percentile of the time from area inactivity to deletion."""
+
+    def __init__(self, coordinator, entry: ConfigEntry, percentile: int) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{entry.entry_id}_cleanup_latency_p{percentile}"
+        self._attr_has_entity_name = True
+        self._attr_icon = "mdi:timer-outline"
+        self._attr_translation_key = f"cleanup_latency_p{percentile}"
+        self._attr_device_class = SensorDeviceClass.DURATION
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_native_unit_of_measurement = UnitOfTime.SECONDS
+        self._attr_suggested_display_precision = 0
+        self._entry = entry
+        self._percentile = percentile
+
+    @property
+    def device_info(self):
+        """Return device information."""
+        return {
+            "identifiers": {(DOMAIN, self._entry.entry_id)},
+            "name": f"Hue Cleaner ({self.coordinator.hue_ip})",
+            "manufacturer": "Custom",
+            "model": "Hue Cleaner",
+        }
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the latency percentile in seconds."""
+        return self.coordinator.cleanup_latency.percentile(self._percentile)
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the state attributes."""
+        return {"samples": self.coordinator.cleanup_latency.count}
+
+
+class HueCleanerLoopBlockSensor(CoordinatorEntity, SensorEntity):
+    """Longest time the integration recently held the event loop."""
+
+    def __init__(self, coordinator, entry: ConfigEntry) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{entry.entry_id}_max_loop_block"
+        self._attr_has_entity_name = True
+        self._attr_icon = "mdi:speedometer-slow"
+        self._attr_translation_key = "max_loop_block"
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_device_class = SensorDeviceClass.DURATION
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+        self._attr_suggested_display_precision = 1
+        self._entry = entry
+
+    @property
+    def device_info(self):
+        """Return device information."""
+        return {
+            "identifiers": {(DOMAIN, self._entry.entry_id)},
+            "name": f"Hue Cleaner ({self.coordinator.hue_ip})",
+            "manufacturer": "Custom",
+            "model": "Hue Cleaner",
+        }
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the longest recent loop block in milliseconds."""
+        return self.coordinator.engine.loop_block.max
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the state attributes."""
+        return {
+            "p95_ms": self.coordinator.engine.loop_block.percentile(95),
+            "large_payload_threshold": self.coordinator.engine.large_payload_threshold,
         }
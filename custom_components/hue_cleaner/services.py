@@ -3,34 +3,102 @@ from __future__ import annotations
 
 import logging
 
-from homeassistant.core import HomeAssistant, ServiceCall
+import voluptuous as vol
 
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+
+from .collectors import COLLECTORS
 from .const import DOMAIN
+from .engine import HueCleanerError
+from .hub import async_get_registry
 
 _LOGGER = logging.getLogger(__name__)
 
+CLEAN_NOW_SCHEMA = vol.Schema(
+    {
+        vol.Optional("collectors"): [vol.In(list(COLLECTORS))],
+    }
+)
+
+PLAN_SCHEMA = vol.Schema(
+    {
+        vol.Optional("include_active", default=False): bool,
+        vol.Optional("collectors"): [vol.In(list(COLLECTORS))],
+    }
+)
+
+EXECUTE_PLAN_SCHEMA = vol.Schema(
+    {
+        vol.Required("plan_id"): str,
+    }
+)
+
 
 async def async_setup_services(hass: HomeAssistant) -> None:
-    """Set up services for Hue Cleaner."""
+    """Set up services for Hue Cleaner, once per domain."""
+    if hass.services.has_service(DOMAIN, "clean_now"):
+        return
 
     async def clean_now(call: ServiceCall) -> None:
         """Service to manually clean inactive entertainment areas."""
-        # Get all coordinators
-        for entry_id, coordinator in hass.data[DOMAIN].items():
-            if isinstance(entry_id, str):  # Skip non-entry items
-                cleaned = await coordinator.async_manual_clean(include_active=False)
-                _LOGGER.info(
-                    f"Manually cleaned {cleaned} inactive entertainment areas")
+        # One coordinator per hub, even if it has several entries
+        for coordinator in async_get_registry(hass).coordinators:
+            cleaned = await coordinator.async_manual_clean(
+                include_active=False, collectors=call.data.get("collectors"))
+            _LOGGER.info(
+                f"Manually cleaned {cleaned} inactive resources")
 
     async def clean_all(call: ServiceCall) -> None:
         """Service to clean all entertainment areas including active ones."""
-        # Get all coordinators
-        for entry_id, coordinator in hass.data[DOMAIN].items():
-            if isinstance(entry_id, str):  # Skip non-entry items
-                cleaned = await coordinator.async_manual_clean(include_active=True)
-                _LOGGER.warning(
-                    f"Manually cleaned {cleaned} entertainment areas (including active)")
+        # One coordinator per hub, even if it has several entries
+        for coordinator in async_get_registry(hass).coordinators:
+            cleaned = await coordinator.async_manual_clean(include_active=True)
+            _LOGGER.warning(
+                f"Manually cleaned {cleaned} entertainment areas (including active)")
+
+    async def plan(call: ServiceCall) -> ServiceResponse:
+        """Service to preview a cleanup and cache it for execute_plan."""
+        plans = []
+        for coordinator in async_get_registry(hass).coordinators:
+            try:
+                plans.append(await coordinator.async_plan(
+                    include_active=call.data["include_active"],
+                    collectors=call.data.get("collectors"),
+                ))
+            except HueCleanerError as err:
+                raise HomeAssistantError(str(err)) from err
+        return {"plans": plans}
+
+    async def execute_plan(call: ServiceCall) -> ServiceResponse:
+        """Service to delete exactly the resources of a cached plan."""
+        plan_id = call.data["plan_id"]
+        for coordinator in async_get_registry(hass).coordinators:
+            if coordinator.has_plan(plan_id):
+                break
+        else:
+            raise ServiceValidationError(f"Unknown or expired plan {plan_id}")
+
+        try:
+            result = await coordinator.async_execute_plan(plan_id)
+        except HueCleanerError as err:
+            raise HomeAssistantError(str(err)) from err
+        _LOGGER.info(
+            f"Plan {plan_id} cleaned {result['cleaned']} of {result['planned']} resources")
+        return result
 
     # Register services
-    hass.services.async_register(DOMAIN, "clean_now", clean_now)
+    hass.services.async_register(
+        DOMAIN, "clean_now", clean_now, schema=CLEAN_NOW_SCHEMA)
     hass.services.async_register(DOMAIN, "clean_all", clean_all)
+    hass.services.async_register(
+        DOMAIN, "plan", plan, schema=PLAN_SCHEMA,
+        supports_response=SupportsResponse.ONLY)
+    hass.services.async_register(
+        DOMAIN, "execute_plan", execute_plan, schema=EXECUTE_PLAN_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL)
@@ -0,0 +1,35 @@
+"""Rolling statistics helpers for Hue Cleaner integration."""
+from __future__ import annotations
+
+import math
+from collections import deque
+
+
+class RollingStats:
+    """Keep the most recent samples and report percentiles over them."""
+
+    def __init__(self, size: int) -> None:
+        """Initialize."""
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def add(self, value: float) -> None:
+        """Record a new sample."""
+        self._samples.append(value)
+
+    @property
+    def count(self) -> int:
+        """Return the number of samples currently held."""
+        return len(self._samples)
+
+    @property
+    def max(self) -> float | None:
+        """Return the largest sample, or None when empty."""
+        return max(self._samples) if self._samples else None
+
+    def percentile(self, percent: float) -> float | None:
+        """Return the nearest-rank percentile, or None when empty."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        rank = max(1, math.ceil(percent / 100 * len(ordered)))
+        return ordered[rank - 1]
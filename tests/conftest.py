@@ -0,0 +1,16 @@
+"""Fixtures for Hue Cleaner tests."""
+import pytest
+
+
+@pytest.fixture
+async def hass(tmp_path):
+    """Return a bare Home Assistant instance with the registries loaded."""
+    pytest.importorskip("homeassistant")
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers import entity_registry, issue_registry
+
+    hass = HomeAssistant(str(tmp_path))
+    await entity_registry.async_load(hass)
+    await issue_registry.async_load(hass)
+    yield hass
+    await hass.async_stop(force=True)
@@ -0,0 +1,50 @@
+"""Tests for the orphaned resource collectors."""
+import pytest
+
+from custom_components.hue_cleaner.collectors import (
+    OrphanCollector,
+    UnusedEntertainmentCollector,
+)
+from custom_components.hue_cleaner.index import BridgeResourceIndex
+
+
+def _configuration(*service_ids: str) -> dict:
+    return {
+        "id": "config-1",
+        "type": "entertainment_configuration",
+        "name": "Gaming",
+        "status": "inactive",
+        "channels": [
+            {"members": [{"service": {"rid": rid, "rtype": "entertainment"}}]}
+            for rid in service_ids
+        ],
+    }
+
+
+def test_unused_entertainment_matches_missing_services():
+    """An area whose entertainment services are all gone is unused."""
+    area = _configuration("ent-1", "ent-2")
+    index = BridgeResourceIndex([area])
+
+    assert UnusedEntertainmentCollector().find(index) == [area]
+
+
+def test_unused_entertainment_keeps_area_with_a_service():
+    """One remaining service keeps the area."""
+    area = _configuration("ent-1", "ent-2")
+    index = BridgeResourceIndex([area, {"id": "ent-2", "type": "entertainment"}])
+
+    assert UnusedEntertainmentCollector().find(index) == []
+
+
+def test_unused_entertainment_keeps_area_without_members():
+    """An area with no channel members is not treated as unused."""
+    index = BridgeResourceIndex([_configuration()])
+
+    assert UnusedEntertainmentCollector().find(index) == []
+
+
+def test_collector_must_implement_is_orphan():
+    """The base collector cannot be used on its own."""
+    with pytest.raises(TypeError):
+        OrphanCollector()
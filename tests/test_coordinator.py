@@ -0,0 +1,79 @@
+"""Tests for the Home Assistant coordinator."""
+import json
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.hue_cleaner.coordinator import HueCleanerCoordinator  # noqa: E402
+from custom_components.hue_cleaner.scheduler import HueRequestScheduler  # noqa: E402
+
+
+def _snapshot(*areas: tuple[str, str]) -> bytes:
+    return json.dumps({
+        "errors": [],
+        "data": [
+            {
+                "id": area_id,
+                "type": "entertainment_configuration",
+                "name": f"Entertainment area {area_id}",
+                "status": status,
+            }
+            for area_id, status in areas
+        ],
+    }).encode()
+
+
+class _FakeHub:
+    """Answer scheduler requests from a mutable snapshot."""
+
+    def __init__(self, body: bytes) -> None:
+        self.body = body
+        self.deleted = []
+
+    async def async_request(self, method, url, headers, priority):
+        if method == "DELETE":
+            self.deleted.append(url.rsplit("/", 1)[1])
+            return 200, b"{}"
+        return 200, self.body
+
+
+async def test_polling_mode_rechecks_soon_while_streaming(hass):
+    """Without sensors, held cleanups drain shortly after streaming stops."""
+    hub = _FakeHub(_snapshot(("tv", "active"), ("old", "inactive")))
+    coordinator = HueCleanerCoordinator(hass, "192.168.0.2", "key")
+
+    with patch.object(HueRequestScheduler, "async_request", hub.async_request), \
+            patch("custom_components.hue_cleaner.engine.DELETE_INTERVAL", 0):
+        assert await coordinator._clean_resources() == 0
+        assert coordinator.engine.has_deferred
+        assert coordinator._unsub_streaming_recheck is not None
+
+        hub.body = _snapshot(("tv", "inactive"), ("old", "inactive"))
+        await coordinator._async_streaming_recheck(None)
+
+    assert sorted(hub.deleted) == ["old", "tv"]
+    assert not coordinator.engine.has_deferred
+    assert coordinator._unsub_streaming_recheck is None
+    await coordinator.async_shutdown()
+
+
+async def test_sensor_changes_handled_on_event_loop(hass):
+    """State changes reach the coordinator on the loop, not an executor thread."""
+    import threading
+
+    hass.states.async_set("binary_sensor.entertainment_area_1", "on")
+    coordinator = HueCleanerCoordinator(hass, "192.168.0.2", "key")
+    await coordinator.async_start()
+    threads = []
+
+    with patch.object(
+        coordinator.engine, "set_streaming",
+        side_effect=lambda streaming: threads.append(threading.current_thread()) or False,
+    ):
+        hass.states.async_set("binary_sensor.entertainment_area_1", "off")
+        await hass.async_block_till_done()
+
+    assert threads == [threading.main_thread()]
+    await coordinator.async_shutdown()
@@ -0,0 +1,197 @@
+"""Tests for the Home Assistant independent engine."""
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from freezegun import freeze_time
+
+from custom_components.hue_cleaner.engine import (
+    HueCleanerEngine,
+    _decode_resources_incrementally,
+)
+
+
+def _area(status: str) -> dict:
+    return {
+        "id": "area-1",
+        "type": "entertainment_configuration",
+        "name": "Entertainment area 1",
+        "status": status,
+    }
+
+
+def _engine(events: list[dict]) -> HueCleanerEngine:
+    return HueCleanerEngine("192.168.0.2", "key", session=None, on_area_cleaned=events.append)
+
+
+def test_area_first_seen_inactive_has_no_latency():
+    """An area never seen active has no known inactivity start."""
+    events = []
+    engine = _engine(events)
+
+    engine._track_area_lifecycle([_area("inactive")])
+    engine._record_area_cleaned(_area("inactive"))
+
+    assert events[0]["inactive_since"] is None
+    assert events[0]["latency_seconds"] is None
+    assert engine.cleanup_latency.count == 0
+
+
+def test_area_latency_counts_from_last_seen_active():
+    """Without sensors the clock starts at the last snapshot showing the area active."""
+    events = []
+    engine = _engine(events)
+
+    with freeze_time("2024-01-01 12:00:00") as frozen:
+        engine._track_area_lifecycle([_area("active")])
+        frozen.tick(timedelta(hours=1))
+        engine._track_area_lifecycle([_area("inactive")])
+        engine._record_area_cleaned(_area("inactive"))
+
+    assert events[0]["inactive_since"] == "2024-01-01T12:00:00+00:00"
+    assert events[0]["latency_seconds"] == 3600
+    assert engine.cleanup_latency.count == 1
+
+
+def test_area_latency_uses_reported_transition():
+    """A transition reported from outside, e.g. a binary sensor, is used as is."""
+    events = []
+    engine = _engine(events)
+    went_inactive = datetime.now(timezone.utc) - timedelta(minutes=10)
+
+    engine._track_area_lifecycle([_area("active")])
+    engine.set_area_inactive_since("area-1", went_inactive)
+    engine._track_area_lifecycle([_area("inactive")])
+    engine._record_area_cleaned(_area("inactive"))
+
+    assert events[0]["inactive_since"] == went_inactive.isoformat()
+    assert events[0]["latency_seconds"] >= 600
+
+
+def test_removed_area_is_forgotten():
+    """Areas deleted by someone else drop out of the lifecycle tracking."""
+    engine = _engine([])
+
+    engine._track_area_lifecycle([_area("active")])
+    engine._track_area_lifecycle([_area("inactive")])
+    engine._track_area_lifecycle([])
+
+    assert not engine._area_first_seen
+    assert not engine._area_last_active
+    assert not engine._area_inactive_since
+
+
+SNAPSHOTS = [
+    {"errors": [], "data": []},
+    {"data": [{"id": "area-1", "type": "entertainment_configuration"}]},
+    {
+        "errors": [{"description": "warning"}],
+        "data": [
+            {"id": "scene-1", "type": "scene", "metadata": {"name": "Soggiorno ☀"}},
+            {"id": "zone-1", "type": "zone", "children": [{"rid": "light-1", "rtype": "light"}]},
+        ],
+        "extra": {"nested": [1, 2, {"data": []}]},
+    },
+    {"errors": []},
+    {},
+]
+
+
+@pytest.mark.parametrize("snapshot", SNAPSHOTS)
+@pytest.mark.parametrize("indent", [None, 2])
+def test_incremental_decode_matches_json_loads(snapshot, indent):
+    """The incremental decoder returns what json.loads finds under "data"."""
+    body = json.dumps(snapshot, indent=indent, ensure_ascii=False).encode()
+
+    assert _decode_resources_incrementally(body) == json.loads(body).get("data", [])
+
+
+@pytest.mark.parametrize("body", [b"", b"   ", b"{1: 2}", b'{"data": []} {}', b'{"data": [}'])
+def test_incremental_decode_rejects_malformed(body):
+    """Malformed snapshots raise ValueError, like json.loads."""
+    with pytest.raises(ValueError):
+        json.loads(body)
+    with pytest.raises(ValueError):
+        _decode_resources_incrementally(body)
+
+
+def test_incremental_decode_rejects_truncated():
+    """Every truncation of a snapshot raises ValueError instead of IndexError."""
+    body = json.dumps(SNAPSHOTS[2]).encode()
+    for cut in range(len(body)):
+        with pytest.raises(ValueError):
+            _decode_resources_incrementally(body[:cut])
+
+
+class _FakeResponse:
+    def __init__(self, status: int, body: bytes):
+        self.status = status
+        self._body = body
+
+    async def __aenter__(self):
+        # Let overlapping cleanups interleave
+        await asyncio.sleep(0)
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def read(self):
+        return self._body
+
+
+class _FakeHubSession:
+    """Serve a snapshot of entertainment areas and delete them like the hub."""
+
+    def __init__(self, area_ids: list[str]):
+        self.areas = {area_id: _area("inactive") | {"id": area_id} for area_id in area_ids}
+        self.deletes = []
+
+    def request(self, method, url, headers, timeout):
+        if method == "DELETE":
+            area_id = url.rsplit("/", 1)[1]
+            self.deletes.append(area_id)
+            if self.areas.pop(area_id, None) is None:
+                return _FakeResponse(404, b"{}")
+            return _FakeResponse(200, b"{}")
+        body = json.dumps({"errors": [], "data": list(self.areas.values())})
+        return _FakeResponse(200, body.encode())
+
+
+async def test_overlapping_cleanups_count_each_area_once():
+    """Two cleanups racing for the same areas delete and report each once."""
+    events = []
+    session = _FakeHubSession(["area-1", "area-2", "area-3"])
+    engine = HueCleanerEngine(
+        "192.168.0.2", "key", session=session, on_area_cleaned=events.append)
+
+    with patch("custom_components.hue_cleaner.engine.DELETE_INTERVAL", 0):
+        results = await asyncio.gather(engine.async_clean(), engine.async_clean())
+
+    assert sum(results) == 3
+    assert engine.cleaned_count == 3
+    assert sorted(event["area_id"] for event in events) == ["area-1", "area-2", "area-3"]
+    assert not session.areas
+    await engine.async_shutdown()
+
+
+async def test_partial_cleanup_keeps_held_work():
+    """An empty plan or collector subset does not end a deferral."""
+    session = _FakeHubSession(["area-1"])
+    session.areas["tv"] = _area("active") | {"id": "tv"}
+    engine = HueCleanerEngine("192.168.0.2", "key", session=session)
+
+    assert await engine.async_clean() == 0
+    assert engine.has_deferred
+
+    plan = await engine.async_plan(collectors=["empty_zone"])
+    result = await engine.async_execute_plan(plan.plan_id)
+    assert result["cleaned"] == 0
+    assert await engine.async_clean(collectors=["empty_zone"]) == 0
+    assert engine.has_deferred
+
+    # Streaming stops: the held cleanup is still there to drain
+    assert engine.set_streaming(False)
+    await engine.async_shutdown()
@@ -0,0 +1,145 @@
+"""Tests for the health state machine and its registry writes."""
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.components import persistent_notification  # noqa: E402
+from homeassistant.helpers import issue_registry  # noqa: E402
+from homeassistant.helpers.update_coordinator import UpdateFailed  # noqa: E402
+
+from custom_components.hue_cleaner.const import DOMAIN, HEALTH_OK  # noqa: E402
+from custom_components.hue_cleaner.coordinator import HueCleanerCoordinator  # noqa: E402
+from custom_components.hue_cleaner.scheduler import HueRequestScheduler  # noqa: E402
+
+HEALTHY = (200, b'{"errors": [], "data": []}')
+UNAVAILABLE = (503, b"Service Unavailable")
+
+
+@pytest.fixture
+def registries():
+    """Patch every registry write the coordinator can make."""
+    with patch.object(issue_registry, "async_create_issue") as create_issue, \
+            patch.object(issue_registry, "async_delete_issue") as delete_issue, \
+            patch.object(persistent_notification, "async_create") as create_notification, \
+            patch.object(persistent_notification, "async_dismiss") as dismiss_notification:
+        yield {
+            "create_issue": create_issue,
+            "delete_issue": delete_issue,
+            "create_notification": create_notification,
+            "dismiss_notification": dismiss_notification,
+        }
+
+
+def _calls(registries) -> dict[str, int]:
+    return {name: mock.call_count for name, mock in registries.items()}
+
+
+def _reset(registries) -> None:
+    for mock in registries.values():
+        mock.reset_mock()
+
+
+@pytest.fixture
+def hub_response():
+    """Control what the hub answers to every request."""
+    response = {"value": HEALTHY}
+
+    async def async_request(scheduler, method, url, headers, priority):
+        return response["value"]
+
+    with patch.object(HueRequestScheduler, "async_request", async_request):
+        yield response
+
+
+@pytest.fixture
+async def coordinator(hass):
+    coordinator = HueCleanerCoordinator(hass, "192.168.0.2", "key")
+    coordinator.load_open_issues()
+    yield coordinator
+    await coordinator.async_shutdown()
+
+
+async def test_steady_state_writes_nothing(coordinator, hub_response, registries):
+    """Repeated successful updates never touch the registries."""
+    for _ in range(5):
+        await coordinator._async_update_data()
+
+    assert sum(_calls(registries).values()) == 0
+
+
+async def test_one_write_per_transition(coordinator, registries):
+    """Each health transition creates or deletes exactly once."""
+    coordinator._set_health("connection_error", "boom")
+    assert _calls(registries) == {
+        "create_issue": 1,
+        "delete_issue": 0,
+        "create_notification": 1,
+        "dismiss_notification": 0,
+    }
+
+    _reset(registries)
+    coordinator._set_health(HEALTH_OK)
+    assert _calls(registries) == {
+        "create_issue": 0,
+        "delete_issue": 1,
+        "create_notification": 0,
+        "dismiss_notification": 1,
+    }
+
+
+async def test_persistent_failure_reports_once(coordinator, hub_response, registries):
+    """Failures are reported once they persist, and only once."""
+    hub_response["value"] = UNAVAILABLE
+    for attempt in range(1, 6):
+        with pytest.raises(UpdateFailed):
+            await coordinator._async_update_data()
+        expected = 0 if attempt < coordinator._max_connection_issues else 1
+        assert registries["create_issue"].call_count == expected
+
+    assert registries["create_notification"].call_count == 1
+    assert registries["delete_issue"].call_count == 0
+
+    _reset(registries)
+    hub_response["value"] = HEALTHY
+    for _ in range(3):
+        await coordinator._async_update_data()
+
+    assert registries["delete_issue"].call_count == 1
+    assert registries["dismiss_notification"].call_count == 1
+    assert registries["create_issue"].call_count == 0
+
+
+async def test_streaming_skip_keeps_issues_open(hass, coordinator, hub_response, registries):
+    """A cleanup the sensors held back says nothing about the hub."""
+    coordinator._set_health("connection_error", "boom")
+    _reset(registries)
+
+    hass.states.async_set("binary_sensor.entertainment_area_1", "on")
+    coordinator._entertainment_area_entities = ["binary_sensor.entertainment_area_1"]
+    await coordinator._async_update_data()
+
+    assert registries["delete_issue"].call_count == 0
+    assert coordinator._health == "connection_error"
+
+
+async def test_issue_from_previous_run_closed_on_first_success(hass, hub_response):
+    """Issues persisted by the last run are closed by the first success."""
+    issue_id = f"{DOMAIN}_connection_error_192.168.0.2"
+    issue_registry.async_create_issue(
+        hass,
+        DOMAIN,
+        issue_id,
+        is_fixable=True,
+        is_persistent=True,
+        severity=issue_registry.IssueSeverity.ERROR,
+        translation_key="connection_error",
+    )
+    coordinator = HueCleanerCoordinator(hass, "192.168.0.2", "key")
+    coordinator.load_open_issues()
+
+    await coordinator._async_update_data()
+
+    assert issue_registry.async_get(hass).async_get_issue(DOMAIN, issue_id) is None
+    await coordinator.async_shutdown()
@@ -0,0 +1,85 @@
+"""Tests for sharing one coordinator per physical hub."""
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant import config_entries  # noqa: E402
+
+from custom_components.hue_cleaner.hub import async_get_registry  # noqa: E402
+from custom_components.hue_cleaner.scheduler import HueRequestScheduler  # noqa: E402
+
+EMPTY_SNAPSHOT = (200, b'{"errors": [], "data": []}')
+
+
+def _entry(entry_id: str) -> MagicMock:
+    entry = MagicMock()
+    entry.entry_id = entry_id
+    entry.unique_id = "001788fffe000000"
+    entry.data = {"host": "192.168.0.2", "api_key": "key"}
+    return entry
+
+
+async def _acquire(hass, entry):
+    # Home Assistant sets the current entry while an entry is being set up
+    token = config_entries.current_entry.set(entry)
+    try:
+        return await async_get_registry(hass).async_acquire(entry)
+    finally:
+        config_entries.current_entry.reset(token)
+
+
+async def test_unloading_first_entry_keeps_shared_coordinator(hass):
+    """The entry that created the coordinator can go away first."""
+    entry_a, entry_b = _entry("a"), _entry("b")
+    registry = async_get_registry(hass)
+
+    with patch.object(HueRequestScheduler, "async_request", return_value=EMPTY_SNAPSHOT):
+        coordinator = await _acquire(hass, entry_a)
+        assert await _acquire(hass, entry_b) is coordinator
+
+        # Not tied to entry A's unload hooks or reauth flow
+        assert coordinator.config_entry is None
+        entry_a.async_on_unload.assert_not_called()
+
+        await registry.async_release(entry_a)
+        assert registry.coordinators == [coordinator]
+        assert not coordinator._shutdown_requested
+
+        await coordinator.async_refresh()
+        assert coordinator.last_update_success
+
+        await registry.async_release(entry_b)
+        assert registry.coordinators == []
+        assert coordinator._shutdown_requested
+
+
+async def test_unreachable_hub_is_not_ready(hass):
+    """A hub that cannot be reached at startup is retried by Home Assistant."""
+    from homeassistant.exceptions import ConfigEntryNotReady
+
+    with patch.object(HueRequestScheduler, "async_request", return_value=(503, b"")):
+        with pytest.raises(ConfigEntryNotReady):
+            await _acquire(hass, _entry("a"))
+
+    assert async_get_registry(hass).coordinators == []
+
+
+async def test_failed_setup_releases_the_hub(hass):
+    """An entry whose setup fails after acquiring the hub gives it back."""
+    from unittest.mock import AsyncMock
+
+    from custom_components.hue_cleaner import async_setup_entry
+    from custom_components.hue_cleaner.const import DOMAIN
+
+    entry = _entry("a")
+    hass.config_entries = MagicMock()
+    hass.config_entries.async_forward_entry_setups = AsyncMock(
+        side_effect=RuntimeError("platform failed"))
+
+    with patch.object(HueRequestScheduler, "async_request", return_value=EMPTY_SNAPSHOT):
+        assert await async_setup_entry(hass, entry) is False
+
+    assert async_get_registry(hass).coordinators == []
+    assert entry.entry_id not in hass.data[DOMAIN]
@@ -0,0 +1,174 @@
+"""Check that loading the integration stays within its import and setup budgets.
+
+Runs a fresh interpreter for:
+1. the package itself, which Home Assistant imports to load the integration
+   and which must not pull in Home Assistant or aiohttp;
+2. every module `async_setup_entry` imports, measured on top of the Home
+   Assistant modules that are already loaded at runtime;
+3. a timed `async_setup_entry` run against a stubbed hub, which must not load
+   anything outside the integration.
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+PACKAGE = "custom_components.hue_cleaner"
+
+# Budgets in milliseconds
+PACKAGE_IMPORT_BUDGET_MS = 5
+SETUP_IMPORT_BUDGET_MS = 40
+SETUP_TIME_BUDGET_MS = 50
+
+# Standard library modules any Python process running Home Assistant has loaded
+STDLIB_PRELOADED = ["logging", "typing"]
+
+# Imported by Home Assistant core before any integration is set up
+HA_PRELOADED = STDLIB_PRELOADED + [
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.helpers.update_coordinator",
+    "homeassistant.helpers.aiohttp_client",
+    "homeassistant.components.sensor",
+    "homeassistant.components.button",
+]
+
+SETUP_MODULES = [
+    f"{PACKAGE}.hub",
+    f"{PACKAGE}.services",
+    f"{PACKAGE}.sensor",
+    f"{PACKAGE}.button",
+]
+
+# Sets up one entry with every hub request answered by an empty snapshot and
+# prints the setup time and the modules it loaded
+SETUP_RUN = """
+import asyncio
+import importlib
+import sys
+import tempfile
+import time
+from unittest.mock import MagicMock
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import aiohttp_client, entity_registry, issue_registry
+
+
+class Response:
+    status = 200
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def read(self):
+        return b'{"errors": [], "data": []}'
+
+
+class Session:
+    def request(self, method, url, headers, timeout):
+        return Response()
+
+
+aiohttp_client.async_get_clientsession = lambda hass, verify_ssl=True: Session()
+
+
+async def forward(entry, platforms):
+    for platform in platforms:
+        importlib.import_module(f"PACKAGE.{platform}")
+
+
+async def main():
+    hass = HomeAssistant(tempfile.mkdtemp())
+    await entity_registry.async_load(hass)
+    await issue_registry.async_load(hass)
+    hass.config_entries = MagicMock()
+    hass.config_entries.async_forward_entry_setups = forward
+    entry = MagicMock(
+        entry_id="entry", unique_id=None, data={"host": "192.168.0.2", "api_key": "key"})
+
+    from PACKAGE import async_setup_entry
+
+    loaded = set(sys.modules)
+    started = time.perf_counter()
+    assert await async_setup_entry(hass, entry)
+    print((time.perf_counter() - started) * 1000)
+    print("\\n".join(set(sys.modules) - loaded))
+    await hass.async_stop(force=True)
+
+
+asyncio.run(main())
+""".replace("PACKAGE", PACKAGE)
+
+# Must not be loaded just by importing the package
+HEAVY_MODULES = ["homeassistant", "aiohttp", f"{PACKAGE}.coordinator"]
+
+
+def _run(code: str, importtime: bool = False) -> subprocess.CompletedProcess:
+    """Run code in a fresh interpreter from the repository root."""
+    options = ["-X", "importtime"] if importtime else []
+    result = subprocess.run(
+        [sys.executable, *options, "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+    )
+    assert result.returncode == 0, result.stderr.strip().splitlines()[-1]
+    return result
+
+
+def _importtime(preload: list[str], modules: list[str]) -> tuple[float, list[str]]:
+    """Import modules after a preload and return (self time in ms, loaded names)."""
+    code = "\n".join(
+        [f"import {name}" for name in preload]
+        + ["import sys", "sys.stderr.write('--- measure ---\\n')"]
+        + [f"import {name}" for name in modules]
+        + ["print('\\n'.join(sys.modules))"]
+    )
+    result = _run(code, importtime=True)
+
+    measured = result.stderr.split("--- measure ---\n", 1)[1]
+    total_us = 0
+    for line in measured.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us = line.split(":", 1)[1].split("|")[0]
+        total_us += int(self_us)
+    return total_us / 1000, result.stdout.splitlines()
+
+
+def test_package_import_within_budget():
+    """Importing the package is cheap and loads nothing heavy."""
+    package_ms, loaded = _importtime(STDLIB_PRELOADED, [PACKAGE])
+
+    assert package_ms <= PACKAGE_IMPORT_BUDGET_MS
+    for heavy in HEAVY_MODULES:
+        assert not any(
+            name == heavy or name.startswith(f"{heavy}.") for name in loaded
+        ), f"Importing the package loads {heavy}"
+
+
+def test_setup_imports_within_budget():
+    """Modules imported by async_setup_entry fit the setup budget."""
+    pytest.importorskip("homeassistant")
+
+    setup_ms, _ = _importtime(HA_PRELOADED, SETUP_MODULES)
+
+    assert setup_ms <= SETUP_IMPORT_BUDGET_MS
+
+
+def test_setup_entry_within_budget():
+    """async_setup_entry is fast and only loads the integration's own modules."""
+    pytest.importorskip("homeassistant")
+
+    preload = "\n".join(f"import {name}" for name in HA_PRELOADED)
+    output = _run(f"{preload}\n{SETUP_RUN}").stdout.splitlines()
+    setup_ms = float(output[0])
+    outside = sorted(name for name in output[1:] if name and not name.startswith(PACKAGE))
+
+    assert setup_ms <= SETUP_TIME_BUDGET_MS
+    assert not outside, f"Setup loads modules outside the integration: {outside}"
@@ -0,0 +1,161 @@
+"""Tests for the per-hub request scheduler."""
+import asyncio
+
+import pytest
+
+from custom_components.hue_cleaner.scheduler import HueRequestScheduler
+
+
+class _FakeResponse:
+    def __init__(self, session, method, url):
+        self._session = session
+        self._method = method
+        self._url = url
+        self.status = 200
+
+    async def __aenter__(self):
+        session = self._session
+        session.calls.append((self._method, self._url))
+        session.in_flight += 1
+        session.max_in_flight = max(session.max_in_flight, session.in_flight)
+        try:
+            await session.release.wait()
+        finally:
+            session.in_flight -= 1
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def read(self):
+        return self._url.encode()
+
+
+class _FakeSession:
+    """Session whose requests block until `release` is set."""
+
+    def __init__(self):
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.release = asyncio.Event()
+
+    def request(self, method, url, headers, timeout):
+        return _FakeResponse(self, method, url)
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_requests_served_in_priority_order():
+    """With one worker busy, queued requests go out lowest priority value first."""
+    session = _FakeSession()
+    scheduler = HueRequestScheduler(session, max_concurrent=1)
+
+    blocker = asyncio.create_task(scheduler.async_request("GET", "first", {}, 2))
+    await _settle()
+    tasks = [
+        asyncio.create_task(scheduler.async_request("GET", url, {}, priority))
+        for url, priority in [("poll", 2), ("event", 1), ("manual", 0)]
+    ]
+    await _settle()
+    session.release.set()
+    await asyncio.gather(blocker, *tasks)
+
+    assert [url for _, url in session.calls] == ["first", "manual", "event", "poll"]
+    await scheduler.async_shutdown()
+
+
+async def test_duplicate_requests_are_merged():
+    """Identical requests share one response and one trip to the hub."""
+    session = _FakeSession()
+    scheduler = HueRequestScheduler(session, max_concurrent=1)
+
+    tasks = [
+        asyncio.create_task(scheduler.async_request("GET", "resource", {}, 2))
+        for _ in range(3)
+    ]
+    await _settle()
+    session.release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert results == [(200, b"resource")] * 3
+    assert len(session.calls) == 1
+    assert scheduler.merged_count == 2
+    await scheduler.async_shutdown()
+
+
+async def test_merged_request_keeps_higher_priority():
+    """A queued request merged at a higher priority jumps the queue."""
+    session = _FakeSession()
+    scheduler = HueRequestScheduler(session, max_concurrent=1)
+
+    blocker = asyncio.create_task(scheduler.async_request("GET", "first", {}, 2))
+    await _settle()
+    tasks = [
+        asyncio.create_task(scheduler.async_request("GET", "other", {}, 1)),
+        asyncio.create_task(scheduler.async_request("GET", "shared", {}, 2)),
+        asyncio.create_task(scheduler.async_request("GET", "shared", {}, 0)),
+    ]
+    await _settle()
+    session.release.set()
+    await asyncio.gather(blocker, *tasks)
+
+    assert [url for _, url in session.calls] == ["first", "shared", "other"]
+    await scheduler.async_shutdown()
+
+
+async def test_concurrency_is_capped():
+    """No more than max_concurrent requests reach the hub at once."""
+    session = _FakeSession()
+    scheduler = HueRequestScheduler(session, max_concurrent=2)
+
+    tasks = [
+        asyncio.create_task(scheduler.async_request("DELETE", f"area-{n}", {}, 2))
+        for n in range(6)
+    ]
+    await _settle()
+    assert session.in_flight == 2
+    session.release.set()
+    await asyncio.gather(*tasks)
+
+    assert session.max_in_flight == 2
+    assert len(session.calls) == 6
+    await scheduler.async_shutdown()
+
+
+async def test_shutdown_releases_in_flight_and_queued_callers():
+    """Callers waiting on a request never hang after shutdown."""
+    session = _FakeSession()
+    scheduler = HueRequestScheduler(session, max_concurrent=1)
+
+    in_flight = asyncio.create_task(scheduler.async_request("GET", "first", {}, 2))
+    queued = asyncio.create_task(scheduler.async_request("GET", "second", {}, 2))
+    await _settle()
+    assert session.in_flight == 1
+
+    await scheduler.async_shutdown()
+
+    for task in (in_flight, queued):
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(task, timeout=1)
+
+
+async def test_deletes_are_never_merged():
+    """Each DELETE has exactly one owner, so only one caller sees it succeed."""
+    session = _FakeSession()
+    scheduler = HueRequestScheduler(session, max_concurrent=1)
+
+    tasks = [
+        asyncio.create_task(scheduler.async_request("DELETE", "area-1", {}, 2))
+        for _ in range(2)
+    ]
+    await _settle()
+    session.release.set()
+    await asyncio.gather(*tasks)
+
+    assert session.calls == [("DELETE", "area-1")] * 2
+    assert scheduler.merged_count == 0
+    await scheduler.async_shutdown()